@@ -0,0 +1,90 @@
+# Measures the cost of @inject per call and on a model tick. Run from the repository root with
+#
+#     python -m benchmarks.injector_benchmark
+#
+# The tick is timed in two fresh processes, one with the model decorated by the previous getattr-loop
+# injector, so the difference is the overhead the current injector removes.
+import subprocess
+import sys
+import time
+import timeit
+
+import model.util.injector as injector
+
+SCALE_FACTOR = 5_000
+CALIBRATION_TICKS = 3
+TIMED_TICKS = 5
+
+
+def legacy_inject(*to_inject):
+    def wrapper(fn):
+        def wrapper2(*args, **kwargs):
+            injectees = []
+            for injectee in to_inject:
+                injectees.append(getattr(injector.Injector.model, injectee))
+
+            return fn(*args, *injectees, **kwargs)
+
+        return wrapper2
+    return wrapper
+
+
+def per_call_overhead():
+    class Model:
+        year = 2012
+        month = 1
+        government = None
+
+    injector.Injector.set_model(Model())
+
+    for inject in (legacy_inject, injector.inject):
+        one = inject("government")(lambda household, government: None)
+        three = inject("year", "month", "government")(lambda household, year, month, government: None)
+
+        for name, fn in (("1 injectee", one), ("3 injectees", three)):
+            seconds = min(timeit.repeat(lambda: fn(None), number=200_000, repeat=5)) / 200_000
+            print("{:>14} {:>11}: {:6.0f} ns/call".format(inject.__name__, name, seconds * 1e9))
+
+
+def tick_time():
+    from model.agents.agent import Agent
+    from model.factories.house_factory import HouseFactory
+    from model.factories.household_factory import HouseholdFactory
+    from model.model import Model
+    from model.runner.runner import RunSettings, Parameters, Rules
+    from model.utility_functions import default_utility_function
+
+    run_settings = RunSettings(start_year=2012, end_year=2013, scale_factor=SCALE_FACTOR,
+                               calibration_length=CALIBRATION_TICKS, number_of_runs=1)
+    parameters = Parameters(default_utility_function, buy_market_price_params=[250, 1500, 180000],
+                            rent_market_price_params=[4, 8, 150])
+
+    Agent.reset_id_iter()
+    model = Model(run_settings, parameters, Rules(), HouseholdFactory(), HouseFactory())
+    model._initialize()
+    model._calibrate()
+
+    model.year = run_settings.start_year
+    model.month = 1
+
+    start = time.perf_counter()
+    for _ in range(TIMED_TICKS):
+        model._tick()
+
+    return (time.perf_counter() - start) / TIMED_TICKS, len(model.households)
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--tick']:
+        print("{:.4f} {}".format(*tick_time()))
+    elif sys.argv[1:] == ['--legacy-tick']:
+        injector.inject = legacy_inject
+        print("{:.4f} {}".format(*tick_time()))
+    else:
+        per_call_overhead()
+
+        for flag, name in (('--legacy-tick', 'legacy_inject'), ('--tick', 'inject')):
+            output = subprocess.run([sys.executable, '-m', 'benchmarks.injector_benchmark', flag],
+                                    capture_output=True, text=True, check=True).stdout.split('\n')
+            seconds, households = output[-2].split()
+            print("{:>14} Households.tick: {:.3f} s for {} households".format(name, float(seconds), households))
@@ -1,6 +1,7 @@
 from model.agents.bank import Bank
 from model.agents.government import Government
 from model.constants import MONTHS
+from model.defaults import DEFAULT_LIBERALISATION_THRESHOLD
 from model.util.injector import inject
 
 
@@ -24,17 +25,22 @@ class BonusBank(Bank):
 
         return super().value_to_monthly_payment(value, household)
 
+    @inject("rules")
+    def values_to_monthly_payments(self, values, household, rules):
+        if rules.buy_bonus["deserve?"](household):
+            values = values - rules.buy_bonus["value"]
+
+        return super().values_to_monthly_payments(values, household)
+
 
 class BonusGovernment(Government):
-    def __init__(self, initial_tax_rate=0):
-        super().__init__(initial_tax_rate)
+    def __init__(self, initial_tax_rate=0, liberalisation_threshold=DEFAULT_LIBERALISATION_THRESHOLD):
+        super().__init__(initial_tax_rate, liberalisation_threshold)
         self.bonuses_rewarded = 0
 
-    @inject("households", "rules")
-    def set_new_tax_rate(self, households, rules):
-        total_rent_allowance_per_month = sum([self.determine_rent_allowance(h, h.contract.get_costs(), h.contract.house)
-                                              for h in households.values()])
-        total_income_per_month = sum([h.income for h in households.values() if h.income > 0])
+    @inject("rules")
+    def set_new_tax_rate(self, rules):
+        total_rent_allowance_per_month, total_income_per_month = self.tax_totals()
         total_bonus_amount_per_month = (self.bonuses_rewarded * rules.buy_bonus['value']) / len(MONTHS)
 
         self.tax_rate = (total_rent_allowance_per_month + total_bonus_amount_per_month) / total_income_per_month
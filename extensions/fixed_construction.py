@@ -70,7 +70,4 @@ def construct_fixed_total(self, _households, year, run_settings):
     # else:
     to_construct = math.floor(FIXED_CONSTRUCT_12_500[year] / run_settings.scale_factor)
 
-    for _ in range(to_construct):
-        new_house = self.get_new_house()
-        self.add(new_house)
-        new_house.list()
+    self.build(to_construct)
@@ -1,21 +1,20 @@
 import collections
 import math
-import random
 
 from model.agents.house import House, RentalHouse, SocialHouse
-from model.agents.market import SocialMarket, Option, SocialListing
-from model.constants import LIST_PRICE_UPDATE_FACTOR, BROCHURE_SIZE
+from model.agents.market import SocialMarket, Option, SocialListing, PRIVATE_SECTOR
+from model.constants import BROCHURE_SIZE
 from model.util.contracts import RentalContract, NoHouse
 from model.util.injector import inject
 
 ShareListing = collections.namedtuple('ShareListing', ['house', 'value', 'share_with'])
 
+SHARE_SECTOR = 'share'
 
-@inject("households", "houses", "rules")
-def set_new_tax_rate_sharing(self, households, houses, rules):
-    total_rent_allowance_per_month = sum([self.determine_rent_allowance(h, h.contract.get_costs(), h.contract.house)
-                                              for h in households.values()])
-    total_income_per_month = sum([h.income for h in households.values() if h.income > 0])
+
+@inject("houses", "rules")
+def set_new_tax_rate_sharing(self, houses, rules):
+    total_rent_allowance_per_month, total_income_per_month = self.tax_totals()
     max_share_bonus_per_month = len([h for h in houses.values() if isinstance(h, ShareHouse)]) * rules.share_bonus
 
     self.tax_rate = (total_rent_allowance_per_month + max_share_bonus_per_month) / total_income_per_month
@@ -157,9 +156,11 @@ class ShareHouse(House):
         else:
             rental_market.list(rental_house)
 
-    @inject("rental_market")
-    def move_out(self, to, by, rental_market):
+    @inject("rental_market", "government")
+    def move_out(self, to, by, rental_market, government):
         self.shared_by.pop(by.id)
+        for household in self.shared_by.values():
+            government.tax_base.changed(household)
 
         if len(self.shared_by) == 0:
             self.list()
@@ -171,14 +172,16 @@ class ShareHouse(House):
         if to is not None:
             to.move_in(by)
 
-    @inject("rental_market")
-    def move_in(self, renter, rental_market, log_transaction=True):
+    @inject("rental_market", "government")
+    def move_in(self, renter, rental_market, government, log_transaction=True):
         if len(self.shared_by) == 2:
             raise RuntimeError("More than two households cannot share house")
 
         wait_time = renter.contract.want_to_move_time if renter.contract.want_to_move else -1
 
         self.shared_by[renter.id] = renter
+        for household in self.shared_by.values():
+            government.tax_base.changed(household)
 
         listing = rental_market.listings[self.id]
         # Here rent price of listing is converted back to original value!!
@@ -190,6 +193,15 @@ class ShareHouse(House):
 
 
 class ShareMarket(SocialMarket):
+    def _listing_pools(self, listing):
+        if isinstance(listing.house, ShareHouse):
+            return SHARE_SECTOR,
+
+        return super()._listing_pools(listing)
+
+    def _decays(self, listing):
+        return not isinstance(listing, ShareListing) and not isinstance(listing.house, SocialHouse)
+
     @inject("houses", "government")
     def list_social_house(self, house, houses, government):
         if house.id in self.listings and isinstance(self.listings[house.id], ShareListing):
@@ -234,14 +246,7 @@ class ShareMarket(SocialMarket):
         houses.update(house)
 
     def get_brochure(self):
-        private_sector_listings = list(
-            filter(lambda listing: isinstance(listing.house, RentalHouse) or isinstance(listing.house, ShareHouse),
-                   self.listings.values()))
-
-        if BROCHURE_SIZE >= len(private_sector_listings):
-            return private_sector_listings
-
-        return random.sample(private_sector_listings, BROCHURE_SIZE)
+        return self.listings.sample(BROCHURE_SIZE, PRIVATE_SECTOR, SHARE_SECTOR)
 
     # TODO: social housing can also be shared -> this is handled right??
     @inject("rules")
@@ -266,10 +271,3 @@ class ShareMarket(SocialMarket):
                 best_option = Option(listing.house, listing_utility)
 
         return best_option
-
-    def _update_prices(self):
-        for house_id in self.listings:
-            listing = self.listings[house_id]
-            if not isinstance(listing, ShareListing) and not isinstance(listing.house, SocialHouse):
-                new_value = round(LIST_PRICE_UPDATE_FACTOR * listing.value)
-                self.listings[house_id] = listing._replace(value=new_value)
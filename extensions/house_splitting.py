@@ -13,11 +13,9 @@ PretendHouse = collections.namedtuple('PretendHouse', ['size', 'quality'])
 COUNTER = { 'prev_number_of_split_houses': 0}
 
 
-@inject("households", "houses", "rules")
-def set_new_tax_rate_splitting(self, households, houses, rules):
-    total_rent_allowance_per_month = sum([self.determine_rent_allowance(h, h.contract.get_costs(), h.contract.house)
-                                              for h in households.values()])
-    total_income_per_month = sum([h.income for h in households.values() if h.income > 0])
+@inject("houses", "rules")
+def set_new_tax_rate_splitting(self, houses, rules):
+    total_rent_allowance_per_month, total_income_per_month = self.tax_totals()
     max_splitting_bonus_per_month = (houses.split_count - COUNTER['prev_number_of_split_houses']) * rules.split_bonus\
                                     / len(MONTHS)
 
@@ -1,20 +1,18 @@
-import random
 from statistics import mean
 
 from model.agents.house import RentalHouse, SocialHouse, BuyHouse
 from model.constants import MONTHS
-from model.util.injector import inject
+from model.util.random_streams import uniform_stream
 
 SPLIT_COST = 50_000
 
+SPLIT_RATIOS = uniform_stream('split_ratio', 'extensions')
+
 COUNTER = {'split_houses_cost_current_year': 0}
 
 
-@inject("households")
-def set_new_tax_rate_splitting(self, households):
-    total_rent_allowance_per_month = sum([self.determine_rent_allowance(h, h.contract.get_costs(), h.contract.house)
-                                              for h in households.values()])
-    total_income_per_month = sum([h.income for h in households.values() if h.income > 0])
+def set_new_tax_rate_splitting(self):
+    total_rent_allowance_per_month, total_income_per_month = self.tax_totals()
     max_splitting_bonus_per_month = (COUNTER['split_houses_cost_current_year']) / len(MONTHS)
 
     self.tax_rate = (total_rent_allowance_per_month + max_splitting_bonus_per_month) / total_income_per_month
@@ -35,7 +33,7 @@ def split_houses_on_buying_market(model, average_household_size):
 
         model.buying_market.listings.pop(house.id)
 
-        split_ratio = max(0.15, min(0.85, random.random()))
+        split_ratio = max(0.15, min(0.85, SPLIT_RATIOS.next()))
         old_size = house.size
         new_size = round(house.size * split_ratio)
 
@@ -56,7 +54,7 @@ def split_houses_on_rental_market(model, average_household_size):
 
         model.rental_market.listings.pop(house.id)
 
-        split_ratio = max(0.15, min(0.85, random.random()))
+        split_ratio = max(0.15, min(0.85, SPLIT_RATIOS.next()))
         old_size = house.size
         new_size = round(house.size * split_ratio)
 
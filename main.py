@@ -1,12 +1,20 @@
-import os
+import argparse
+import sys
+
+from model.runner.scheduler import discover_policies, run_policies
+from policies.run_settings import WORKERS
 
 hypotheses = ["hypothesis1"] #, "hypothesis2", "hypothesis3", "hypothesis4", "construction_exploration", "misc"]
 
-for dir_name in hypotheses:
-    files = os.listdir("policies/{}".format(dir_name))
-    for file_name in files:
-        if file_name == "__init__.py" or file_name == "__pycache__":
-            continue
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the policies in the given directories of policies/")
+    parser.add_argument('directories', nargs='*', default=hypotheses)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--force', action='store_true', help="also run variants with up to date output")
+    args = parser.parse_args()
+
+    failed = run_policies(discover_policies(args.directories), args.workers, force=args.force)
 
-        print("Running {}/{}".format(dir_name, file_name))
-        os.system("python policies/{}/{}".format(dir_name, file_name))
+    if len(failed) > 0:
+        print("Failed: {}".format(", ".join(variant.model_name for variant in failed)))
+        sys.exit(1)
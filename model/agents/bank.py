@@ -1,3 +1,5 @@
+import numpy as np
+
 from model.agents.agent import Agent
 from model.constants import MORTGAGE_DURATION, MORTGAGE_INTEREST_RATE, MONTHS, LIVING_QUOTE_TABLE, \
     ANNUITY_TABLE, WEALTH_BIDDING_PORTION
@@ -28,6 +30,26 @@ class Bank(Agent):
 
         return round(total_mortgage), round(total_mortgage / (self.mortgage_duration * len(MONTHS)))
 
+    def values_to_monthly_payments(self, values, household):
+        return self.monthly_payments(values, household.wealth)
+
+    def monthly_payments(self, values, wealths):
+        need_mortgage_for = values - np.where(wealths > 0, np.round(WEALTH_BIDDING_PORTION * wealths), 0)
+
+        total_mortgage = need_mortgage_for * (1 + self.interest_rate)
+        monthly_payments = np.round(total_mortgage / (self.mortgage_duration * len(MONTHS)))
+
+        return np.where(need_mortgage_for <= 0, 0, monthly_payments)
+
+    def max_bids(self, incomes, wealths):
+        test_incomes = incomes * len(MONTHS)
+        maximal_living_costs = test_incomes * LIVING_QUOTE_TABLE[self.interest_rate]
+        max_mortgages = np.round(maximal_living_costs / ANNUITY_TABLE[(self.mortgage_duration, self.interest_rate)])
+        max_house_values_for_mortgage = (1 - self.interest_rate) * max_mortgages
+
+        return np.where(wealths >= 0, max_house_values_for_mortgage + WEALTH_BIDDING_PORTION * wealths,
+                        max_house_values_for_mortgage)
+
     def _max_mortgage(self, income):
         test_income = income * len(MONTHS)
         maximal_living_cost = test_income * LIVING_QUOTE_TABLE[self.interest_rate]
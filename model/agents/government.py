@@ -1,4 +1,7 @@
 import collections
+import math
+
+import numpy as np
 
 from model.agents.agent import Agent
 from model.agents.house import BuyHouse, RentalHouse, SocialHouse
@@ -9,16 +12,78 @@ from model.util.injector import inject
 BasicRentParameters = collections.namedtuple('BasicRentParameters', ['a', 'b', 'min_income_limit',
                                                                      'target_amount', 'min_basic_rent'])
 
+# Indexed by [size > 1][age >= PENSION_AGE].
+BASIC_RENT_PARAMETERS = (
+    (BasicRentParameters(0.000000623385, 0.002453085056, 16_950, 16.94, 237.62),
+     BasicRentParameters(0.000000840817, -0.004129343663, 18_775, 16.94, 235.80)),
+    (BasicRentParameters(0.000000361614, 0.002075390738, 22_000, 16.94, 237.62),
+     BasicRentParameters(0.000000519036, -0.004315550434, 25_025, 16.94, 233.99)),
+)
+BASIC_RENT_PARAMETER_TABLE = BasicRentParameters(*[np.array([[parameters[i] for parameters in row]
+                                                             for row in BASIC_RENT_PARAMETERS])
+                                                   for i in range(len(BasicRentParameters._fields))])
+
 
 def _get_basic_rent_parameters(household):
-    if household.size == 1 and household.age < PENSION_AGE:
-        return BasicRentParameters(0.000000623385, 0.002453085056, 16_950, 16.94, 237.62)
-    if household.size > 1 and household.age < PENSION_AGE:
-        return BasicRentParameters(0.000000361614, 0.002075390738, 22_000, 16.94, 237.62)
-    if household.size == 1 and household.age >= PENSION_AGE:
-        return BasicRentParameters(0.000000840817, -0.004129343663, 18_775, 16.94, 235.80)
-    if household.size > 1 and household.age >= PENSION_AGE:
-        return BasicRentParameters(0.000000519036, -0.004315550434, 25_025, 16.94, 233.99)
+    return BASIC_RENT_PARAMETERS[household.size > 1][household.age >= PENSION_AGE]
+
+
+def _get_basic_rent_parameter_arrays(sizes, ages):
+    multi = (sizes > 1).astype(np.intp)
+    old = (ages >= PENSION_AGE).astype(np.intp)
+
+    return BasicRentParameters(*[table[multi, old] for table in BASIC_RENT_PARAMETER_TABLE])
+
+
+class TaxBase:
+    # Rent allowance and positive income per household, with running totals. Households are marked as changed
+    # when their contract, wealth or membership changes, so a new tax rate only recomputes those.
+    def __init__(self):
+        self.allowances = {}
+        self.incomes = {}
+        self.total_allowance = 0
+        self.total_income = 0
+        self._changed = {}
+        self._stale = True
+
+    def changed(self, household):
+        self._changed[household.id] = household
+
+    def removed(self, household):
+        self._changed.pop(household.id, None)
+        self.total_allowance -= self.allowances.pop(household.id, 0)
+        self.total_income -= self.incomes.pop(household.id, 0)
+
+    def invalidate(self):
+        self._stale = True
+
+    def totals(self, government, households):
+        if self._stale:
+            self.recompute(government, households)
+        elif self._changed:
+            changed = [h for h in self._changed.values() if h.id in households._agents]
+            allowances = government.rent_allowances(changed)
+
+            for household, allowance in zip(changed, allowances.tolist()):
+                income = household.income if household.income > 0 else 0
+                self.total_allowance += allowance - self.allowances.get(household.id, 0)
+                self.total_income += income - self.incomes.get(household.id, 0)
+                self.allowances[household.id] = allowance
+                self.incomes[household.id] = income
+
+        self._changed = {}
+        return self.total_allowance, self.total_income
+
+    def recompute(self, government, households):
+        households = list(households.values())
+        allowances = government.rent_allowances(households).tolist()
+
+        self.allowances = {h.id: allowance for h, allowance in zip(households, allowances)}
+        self.incomes = {h.id: h.income if h.income > 0 else 0 for h in households}
+        self.total_allowance = math.fsum(self.allowances.values())
+        self.total_income = math.fsum(self.incomes.values())
+        self._changed = {}
+        self._stale = False
 
 
 class Government(Agent):
@@ -26,6 +91,7 @@ class Government(Agent):
         super().__init__()
         self.tax_rate = initial_tax_rate
         self.liberalisation_threshold = liberalisation_threshold
+        self.tax_base = TaxBase()
 
     def update(self):
         self.set_new_tax_rate()
@@ -40,17 +106,42 @@ class Government(Agent):
 
         if percentage_social < 0.5:
             self.liberalisation_threshold *= 1.05
+            self.tax_base.invalidate()
         elif percentage_social > 0.75:
             self.liberalisation_threshold *= 0.95
+            self.tax_base.invalidate()
 
-    @inject("households")
-    def set_new_tax_rate(self, households):
-        total_rent_allowance_per_month = sum([self.determine_rent_allowance(h, h.contract.get_costs(), h.contract.house)
-                                              for h in households.values()])
-        total_income_per_month = sum([h.income for h in households.values() if h.income > 0])
+    def set_new_tax_rate(self):
+        total_rent_allowance_per_month, total_income_per_month = self.tax_totals()
 
         self.tax_rate = total_rent_allowance_per_month / total_income_per_month
 
+    @inject("households", "run_settings")
+    def tax_totals(self, households, run_settings):
+        totals = self.tax_base.totals(self, households)
+
+        if run_settings.check_tax_base:
+            check = TaxBase()
+            check.recompute(self, households)
+
+            expected = check.total_allowance, check.total_income
+            if not all(math.isclose(total, expected_total, rel_tol=1e-9, abs_tol=1e-6)
+                       for total, expected_total in zip(totals, expected)):
+                raise RuntimeError("Tax base totals {} differ from full recompute {}".format(totals, expected))
+
+        return totals
+
+    def rent_allowances(self, households):
+        contracts = [h.contract for h in households]
+
+        return self.determine_rent_allowances(
+            np.array([h.income for h in households], dtype=float),
+            np.array([h.wealth for h in households], dtype=float),
+            np.array([h.size for h in households]),
+            np.array([h.age for h in households]),
+            np.array([c.get_costs() for c in contracts], dtype=float),
+            np.array([isinstance(c.house, BuyHouse) for c in contracts], dtype=bool))
+
     def determine_rent_allowance(self, household, rent, house):
         if isinstance(house, BuyHouse):
             return 0
@@ -82,3 +173,25 @@ class Government(Agent):
 
         return part_a + part_b + part_c
 
+    def determine_rent_allowances(self, incomes, wealths, sizes, ages, rents, for_sale):
+        over_wealth_limit = ((wealths > RENT_ALLOWANCE_WEALTH_LIMIT_ONE_PERSON) & (sizes == 1)) | \
+                            ((wealths > RENT_ALLOWANCE_WEALTH_LIMIT_MULTI_PERSON) & (sizes > 1))
+
+        quality_discount_limit = 0.58 * self.liberalisation_threshold
+        max_rent_limit = np.where(ages < 23, quality_discount_limit, self.liberalisation_threshold)
+
+        calculation_incomes = np.maximum(0, incomes * len(MONTHS))
+
+        brp = _get_basic_rent_parameter_arrays(sizes, ages)
+
+        basic_rents = np.where(calculation_incomes <= brp.min_income_limit, brp.min_basic_rent,
+                               brp.a * calculation_incomes ** 2 + brp.b * calculation_incomes + brp.target_amount)
+
+        capping_limits = np.where(sizes <= 2, 0.84 * self.liberalisation_threshold,
+                                  0.9 * self.liberalisation_threshold)
+
+        part_a = np.maximum(0, np.minimum(rents, quality_discount_limit) - basic_rents)
+        part_b = np.maximum(0, np.minimum(rents, capping_limits) - np.maximum(basic_rents, quality_discount_limit)) * 0.65
+        part_c = np.maximum(0, rents - np.maximum(basic_rents, capping_limits)) * 0.40
+
+        return np.where(for_sale | over_wealth_limit | (rents > max_rent_limit), 0, part_a + part_b + part_c)
@@ -1,9 +1,36 @@
+import collections
+import heapq
+import itertools
+
+import numpy as np
+
 from model.agents.agent import Agent
 from model.constants import WEALTH_BIDDING_PORTION
 from model.util.contracts import BuyingContract, RentalContract
 from model.util.injector import inject
 
 
+HouseArrays = collections.namedtuple('HouseArrays', ['id', 'size', 'quality', 'for_sale', 'house'])
+
+INTEREST_ORDER = itertools.count()
+
+
+def object_array(objects):
+    # np.array would look into the objects if they happen to be sequences
+    array = np.empty(len(objects), dtype=object)
+    array[:] = objects
+
+    return array
+
+
+def house_arrays(houses):
+    return HouseArrays(id=np.array([house.id for house in houses], dtype=np.int64),
+                       size=np.array([house.size for house in houses], dtype=float),
+                       quality=np.array([house.quality for house in houses], dtype=float),
+                       for_sale=np.array([isinstance(house, BuyHouse) for house in houses], dtype=bool),
+                       house=object_array(houses))
+
+
 class House(Agent):
     def __init__(self, size, quality):
         super().__init__()
@@ -82,7 +109,12 @@ class SocialHouse(House):
         self.renter = renter
 
         self.value = value
-        self.interested = []
+
+        # Interested households by id, with the contract they had when they showed interest, and a heap of
+        # (-wait_list_time, order of interest, household). Wait list times all grow together, so the heap
+        # order stays valid.
+        self.interested = {}
+        self._waiting = []
 
     @inject("rental_market")
     def list(self, rental_market):
@@ -96,8 +128,29 @@ class SocialHouse(House):
         if to is not None:  # and by is not None:
             to.move_in(by)
 
-    def show_interest(self, by):
-        self.interested.append(by)
+    @inject("rental_market")
+    def show_interest(self, by, rental_market):
+        if by.id in self.interested:
+            return
+
+        self.interested[by.id] = by.contract
+        heapq.heappush(self._waiting, (-by.wait_list_time, next(INTEREST_ORDER), by))
+        rental_market.interest_shown(self)
+
+    def longest_waiting(self, households):
+        # Households that died or moved since they showed interest are dropped on the way.
+        while len(self._waiting) > 0:
+            _, _, household = heapq.heappop(self._waiting)
+            contract = self.interested.pop(household.id)
+
+            if household.id in households and household.contract is contract:
+                return household
+
+        return None
+
+    def clear_interest(self):
+        self.interested = {}
+        self._waiting = []
 
     @inject("rental_market")
     def move_in(self, renter, rental_market, log_transaction=True):
@@ -108,8 +161,7 @@ class SocialHouse(House):
         contract = RentalContract(self.value, self)
         renter.set_contract(contract)
         self.renter = renter
-
-        self.interested = []
+        self.clear_interest()
 
         rental_market.transact(self.id, renter.id, wait_time, log_transaction=log_transaction)
 
@@ -1,18 +1,93 @@
 import collections
-import random
+
+import numpy as np
 
 from model.agents.agent import Agent
-from model.agents.house import SocialHouse, BuyHouse
+from model.agents.house import SocialHouse, BuyHouse, object_array
 from model.constants import ESSENTIAL_COSTS, MIN_AGE
-from model.util.contracts import Homeless, THE_NO_HOUSE
+from model.util.contracts import Homeless, THE_NO_HOUSE, NoHouse
 from model.util.injector import inject
+from model.util.random_streams import uniform_stream
+
+WAIT_LIST_TIME_DRAWS = uniform_stream('wait_list_time', 'households')
 
 TimeLineEntry = collections.namedtuple('TimeLineEntry', ('year', 'month', 'record'))
+HouseholdArrays = collections.namedtuple('HouseholdArrays', ['income', 'wealth', 'size', 'age',
+                                                             'run_time', 'homeless', 'house_id', 'household'])
 
 @inject("year", "month")
 def new_timeline_entry(info, year, month):
     return TimeLineEntry(year, month, info)
 
+def household_arrays(households):
+    contracts = [household.contract for household in households]
+
+    return HouseholdArrays(income=np.array([household.income for household in households], dtype=float),
+                           wealth=np.array([household.wealth for household in households], dtype=float),
+                           size=np.array([household.size for household in households], dtype=float),
+                           age=np.array([household.age for household in households], dtype=float),
+                           run_time=np.array([contract.run_time for contract in contracts], dtype=float),
+                           homeless=np.array([isinstance(contract.house, NoHouse) for contract in contracts],
+                                             dtype=bool),
+                           house_id=np.array([contract.house.id for contract in contracts], dtype=np.int64),
+                           household=object_array(households))
+
+
+@inject("government")
+def left_over_money_batch(incomes, wealths, sizes, ages, housing_costs, for_sale, government):
+    if not is_stock('left_over_money'):
+        raise RuntimeError("Household.left_over_money is replaced by a policy, left_over_money_batch would ignore it")
+
+    allowances = government.determine_rent_allowances(incomes, wealths, sizes, ages, housing_costs, for_sale)
+    taxes = np.where(incomes > 0, incomes * government.tax_rate, 0)
+
+    essential_costs_by_household_size = (0.9 + 0.05 * sizes) * ESSENTIAL_COSTS
+    left_over = incomes - essential_costs_by_household_size - housing_costs + allowances - taxes
+
+    spend = np.round(2 * np.maximum(left_over, 0) ** 0.75)
+    return np.where(left_over > 0, left_over - spend, left_over)
+
+
+@inject("parameters")
+def current_utilities(households, parameters):
+    if not is_stock('current_utility', 'utility'):
+        return np.array([household.current_utility() for household in households])
+
+    return parameters.utility.batch(households, [household.contract.house for household in households],
+                                    [household.contract.get_costs() for household in households])
+
+
+@inject("parameters")
+def current_utilities_around(households, change, parameters):
+    # The current utility of every household before and after change(household). The random terms go to the
+    # households in the order of calling current_utility(), change() and current_utility() again household by
+    # household, also when the utilities are scored in two batches.
+    utility = parameters.utility
+    if not is_stock('current_utility', 'utility') or not utility.scores_in_batches(len(households)):
+        before_utilities, after_utilities = [], []
+        for household in households:
+            before_utilities.append(household.current_utility())
+            change(household)
+            after_utilities.append(household.current_utility())
+
+        return before_utilities, after_utilities
+
+    rums = utility.normal_distribution_store.next_batch(2 * len(households)).reshape(len(households), 2)
+
+    houses = [household.contract.house for household in households]
+    costs = [household.contract.get_costs() for household in households]
+    before_utilities = utility.batch(households, houses, costs, rums[:, 0])
+
+    for household in households:
+        change(household)
+
+    houses = [household.contract.house for household in households]
+    costs = [household.contract.get_costs() for household in households]
+    after_utilities = utility.batch(households, houses, costs, rums[:, 1])
+
+    return before_utilities, after_utilities
+
+
 class Household(Agent):
     def __init__(self, age, size, income_percentile, income, wealth, contract=None):
         super().__init__()
@@ -23,14 +98,14 @@ class Household(Agent):
         self.wealth = wealth
         self._contract = contract
         self.history = []
-        self.wait_list_time = age - MIN_AGE if random.random() < 0.75 else 0
+        self.wait_list_time = age - MIN_AGE if WAIT_LIST_TIME_DRAWS.next() < 0.75 else 0
 
         born_info = {'type': 'BORN', 'id': self.id, 'age': self.age, 'size': self.size,
                      'income_percentile': self.income_percentile}
         self.timeline = [new_timeline_entry(born_info)]
 
-    @inject("year")
-    def set_contract(self, contract, year):
+    @inject("year", "government")
+    def set_contract(self, contract, year, government):
         if year is not None:
             contract_info = {'type': 'CONTRACT_CHANGE', 'house_id': contract.house.id, 'house_size': contract.house.size,
                          'house_quality': contract.house.quality, 'cost': contract.get_costs(),
@@ -39,6 +114,7 @@ class Household(Agent):
 
         self.history.append(contract.to_record())
         self._contract = contract
+        government.tax_base.changed(self)
 
     @property
     def contract(self):
@@ -65,11 +141,20 @@ class Household(Agent):
     def utility(self, house, cost, parameters):
         return parameters.utility(self, house, cost)
 
-    def gain_wealth(self):
+    @inject("parameters")
+    def utilities(self, houses, costs, parameters):
+        if not is_stock('utility'):
+            return np.array([self.utility(house, cost) for house, cost in zip(houses, costs)])
+
+        return parameters.utility.batch([self] * len(houses), houses, costs)
+
+    @inject("government")
+    def gain_wealth(self, government):
         left_over_money = self.left_over_money(self._contract.get_costs(), self._contract.house)
 
         if left_over_money >= 0 or self.wealth + left_over_money >= 0:
             self.wealth += left_over_money
+            government.tax_base.changed(self)
         else:
             self._contract.house.move_out(THE_NO_HOUSE, self)
 
@@ -81,8 +166,10 @@ class Household(Agent):
         self.wealth += winnings_from_selling
         self.assign_homelessness()
 
-    def assign_homelessness(self):
+    @inject("government")
+    def assign_homelessness(self, government):
         self._contract = Homeless()
+        government.tax_base.changed(self)
 
     def remove(self):
         if hasattr(self._contract.house, 'owner'):
@@ -113,3 +200,12 @@ class Household(Agent):
         return "Household({}, {}, {}, {:.2f}, {}, {})".format(self.id, self.age, self.size,
                                                               self.income_percentile,
                                                               self.income, self.wealth)
+
+
+# The batch paths repeat these methods with arrays, so they are only taken while no policy has replaced them
+STOCK_METHODS = {name: getattr(Household, name) for name in ['left_over_money', 'utility', 'current_utility',
+                                                               'look_at_markets']}
+
+
+def is_stock(*method_names):
+    return all(getattr(Household, name) is STOCK_METHODS[name] for name in method_names)
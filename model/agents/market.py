@@ -1,50 +1,92 @@
 import collections
 import math
-import random
 
 import numpy as np
-from sklearn.linear_model import LinearRegression
 
 from model.agents.house import SocialHouse, RentalHouse
 from model.constants import BROCHURE_SIZE, N_LAST_TRANSACTIONS, NEW_LIST_PRICE_FACTOR, \
-    LIST_PRICE_UPDATE_FACTOR, MONTHS
+    LIST_PRICE_UPDATE_FACTOR, MONTHS, MIN_BATCH_SIZE
+from model.containers.listings import Listings
+from model.containers.transaction_log import TransactionLog
+from model.util.least_squares import SlidingLeastSquares
 from model.util.injector import inject
+from model.util.random_streams import uniform_stream
 
 Listing = collections.namedtuple('Listing', ['house', 'value'])
 Transaction = collections.namedtuple('Transaction', ['house_id', 'size', 'quality', 'value', 'wait_time', 'by', 'sector'])
 Option = collections.namedtuple('Option', ['house', 'utility'])
 
+PRIVATE_SECTOR = 'private'
+SOCIAL_SECTOR = 'social'
+NO_INCOME_LIMIT = 'no_income_limit'
+
+NO_INCOME_LIMIT_DRAWS = uniform_stream('no_income_limit', 'markets')
+
+
+def _brochure_values(brochure):
+    return np.array([listing.value for listing in brochure], dtype=float)
+
 
 class SocialListing:
     def __init__(self, house, value):
         self.house = house
         self.value = value
-        self.no_income_limit = random.random() < 0.15
+        self.no_income_limit = NO_INCOME_LIMIT_DRAWS.next() < 0.15
 
 
 class Market:
-    def __init__(self, size_weight, quality_weight, intercept=0, min_price=0, max_price=math.inf):
-        self.listings = {}
+    def __init__(self, size_weight, quality_weight, intercept=0, min_price=0, max_price=math.inf,
+                 batch_evaluation=False):
+        self.listings = self._create_listings()
+        self.batch_evaluation = batch_evaluation
 
         self.new_houses_for_listings = []
         self.min_price = min_price
         self.max_price = max_price
 
-        self.market_price_regression_model = LinearRegression()
-        self.market_price_regression_model.coef_ = np.array([size_weight, quality_weight])
-        self.market_price_regression_model.intercept_ = intercept
+        self.market_price_regression_model = SlidingLeastSquares([size_weight, quality_weight], intercept)
+
+        self._price_cache = {}
+        self.price_cache_hits = 0
+        self.price_cache_misses = 0
 
-        self.transaction_log = {}
+        self.transaction_log = TransactionLog()
+        self._fit_window = (0, 0)
+
+    def _create_listings(self, index_values=False):
+        return Listings(self._listing_pools, index_values=index_values, decays=self._decays,
+                        decay_factor=LIST_PRICE_UPDATE_FACTOR)
+
+    def _listing_pools(self, listing):
+        return ()
+
+    def _decays(self, listing):
+        return True
 
     def fit_market_price_parameters(self):
         if len(self.transaction_log) == 0:
             return
 
-        transactions_to_fit_on = self._get_last_transactions(N_LAST_TRANSACTIONS)
-        input_data = [[t.size, t.quality] for t in transactions_to_fit_on]
-        output_data = [t.value for t in transactions_to_fit_on]
+        # Slide the window of the last N_LAST_TRANSACTIONS rows: remove the rows that dropped out of it since
+        # the last fit and add the new ones.
+        start, end = self._fit_window
+        new_end = len(self.transaction_log)
+        new_start = max(0, new_end - N_LAST_TRANSACTIONS)
+
+        model = self.market_price_regression_model
+        model.remove(*self._fit_data(start, min(new_start, end)))
+        model.add(*self._fit_data(max(new_start, end), new_end))
+
+        coef, intercept = model.coef_, model.intercept_
+        model.solve()
+        if not np.array_equal(coef, model.coef_) or intercept != model.intercept_:
+            self._price_cache = {}
 
-        self.market_price_regression_model.fit(input_data, output_data)
+        self._fit_window = (new_start, new_end)
+
+    def _fit_data(self, start, end):
+        transactions = self.transaction_log.rows(start, end)
+        return np.column_stack([transactions.size, transactions.quality]), transactions.value
 
     def list(self, house):
         if house.id in self.listings:
@@ -52,6 +94,11 @@ class Market:
 
         self.new_houses_for_listings.append(house)
 
+    def list_new_houses(self, houses):
+        # Houses that were just built, so none of them is listed yet. They are priced together with the
+        # other new listings at the next update.
+        self.new_houses_for_listings.extend(houses)
+
     def update(self):
         self._update_prices()
         self._process_new_listings()
@@ -68,28 +115,22 @@ class Market:
 
     @inject("year", "month")
     def _add_transaction_to_log(self, transaction, year, month):
-        if year not in self.transaction_log:
-            self.transaction_log[year] = {}
-        if month not in self.transaction_log[year]:
-            self.transaction_log[year][month] = []
-
-        self.transaction_log[year][month].append(transaction)
+        self.transaction_log.append(transaction, year, month)
 
-    def _get_last_transactions(self, number_of_transactions):
-        result = []
-
-        for year_log in self.transaction_log.values():
-            for month_log in year_log.values():
-                result += month_log
+    def _get_market_prices(self, data):
+        # Clipped and rounded predictions are cached per (size, quality) until the price model changes.
+        keys = [tuple(row) for row in data]
+        missing = list(dict.fromkeys(key for key in keys if key not in self._price_cache))
 
-        return result[-number_of_transactions:]
+        self.price_cache_misses += len(missing)
+        self.price_cache_hits += len(keys) - len(missing)
 
-    def _get_market_prices(self, data):
-        if len(data) == 0:
-            return []
+        if len(missing) > 0:
+            prices = self.market_price_regression_model.predict(missing)
+            for key, price in zip(missing, prices):
+                self._price_cache[key] = round(min(self.max_price, max(self.min_price, price)))
 
-        prices = self.market_price_regression_model.predict(data)
-        return list(map(lambda price: round(min(self.max_price, max(self.min_price, price))), prices))
+        return [self._price_cache[key] for key in keys]
 
     def _process_new_listings(self):
         house_data = [[house.size, house.quality] for house in self.new_houses_for_listings]
@@ -102,17 +143,36 @@ class Market:
         self.new_houses_for_listings = []
 
     def _update_prices(self):
-        for house_id in self.listings:
-            listing = self.listings[house_id]
-            new_value = round(LIST_PRICE_UPDATE_FACTOR * listing.value)
-            self.listings[house_id] = listing._replace(value=new_value)
+        self.listings.decay()
+
+    @staticmethod
+    def _get_best_option_from_brochure(household, brochure, costs):
+        # Only used for brochures of at least MIN_BATCH_SIZE listings, smaller ones take the scalar loops
+        if len(brochure) == 0:
+            return Option(None, -math.inf)
+
+        houses = [listing.house for listing in brochure]
+        utilities = household.utilities(houses, costs)
+        best = int(np.argmax(utilities))
+
+        return Option(houses[best], utilities[best])
 
 
 class BuyingMarket(Market):
+    def __init__(self, *args, affordable_brochures=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.affordable_brochures = affordable_brochures
+        self.listings = self._create_listings(index_values=affordable_brochures)
+
     @inject("bank")
     def get_best_option_from_market(self, household, bank):
         max_bid = bank.max_bid(household)
         brochure = self.get_brochure(max_bid)
+
+        if self.batch_evaluation and len(brochure) >= MIN_BATCH_SIZE:
+            monthly_payments = bank.values_to_monthly_payments(_brochure_values(brochure), household)
+            return self._get_best_option_from_brochure(household, brochure, monthly_payments)
+
         best_option = Option(None, -math.inf)
 
         for listing in brochure:
@@ -125,15 +185,30 @@ class BuyingMarket(Market):
         return best_option
 
     def get_brochure(self, max_bid):
-        if BROCHURE_SIZE > len(self.listings):
-            brochure = list(self.listings.values())
-        else:
-            brochure = random.sample(list(self.listings.values()), BROCHURE_SIZE)
+        if self.affordable_brochures:
+            return self.listings.sample_affordable(BROCHURE_SIZE, max_bid)
+
+        brochure = self.listings.sample(BROCHURE_SIZE)
 
         return list(filter(lambda listing: listing.value <= max_bid, brochure))
 
 
 class SocialMarket(Market):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._houses_with_interest = {}
+
+    def _listing_pools(self, listing):
+        if isinstance(listing.house, RentalHouse):
+            return PRIVATE_SECTOR,
+        if isinstance(listing.house, SocialHouse):
+            return (SOCIAL_SECTOR, NO_INCOME_LIMIT) if listing.no_income_limit else (SOCIAL_SECTOR,)
+
+        return ()
+
+    def _decays(self, listing):
+        return isinstance(listing.house, RentalHouse)
+
     @inject("houses", "government")
     def list_social_house(self, house, houses, government):
         if house.value <= government.liberalisation_threshold:
@@ -149,14 +224,24 @@ class SocialMarket(Market):
         super().update()
         self._assign_social_housing()
 
-    def _assign_social_housing(self):
-        social_listings_with_interest = list(filter(lambda l: isinstance(l.house, SocialHouse)
-                                                              and len(l.house.interested) > 0,
-                                                    self.listings.values()))
+    def interest_shown(self, house):
+        self._houses_with_interest[house.id] = house
+
+    @inject("households")
+    def _assign_social_housing(self, households):
+        houses_with_interest = self._houses_with_interest
+        self._houses_with_interest = {}
+
+        for house in houses_with_interest.values():
+            # A house that is no longer listed as itself drops the interest shown in it, so its waiting
+            # households are not kept alive and not offered the house when it is listed again.
+            if house.id not in self.listings or self.listings[house.id].house is not house:
+                house.clear_interest()
+                continue
 
-        for listing in social_listings_with_interest:
-            longest_waiting_household = max(listing.house.interested, key=lambda household: household.wait_list_time)
-            listing.house.move_in(longest_waiting_household)
+            longest_waiting_household = house.longest_waiting(households)
+            if longest_waiting_household is not None:
+                house.move_in(longest_waiting_household)
 
     @inject("houses", "government")
     def _process_new_listings(self, houses, government):
@@ -170,37 +255,16 @@ class SocialMarket(Market):
                 self.listings[social_house.id] = SocialListing(house=social_house, value=value)
                 houses.update(social_house)
 
-    def _update_prices(self):
-        for house_id in self.listings:
-            listing = self.listings[house_id]
-            if isinstance(listing.house, RentalHouse):
-                new_value = round(LIST_PRICE_UPDATE_FACTOR * listing.value)
-                self.listings[house_id] = listing._replace(value=new_value)
-
     def get_brochure(self):
-        private_sector_listings = list(
-            filter(lambda listing: isinstance(listing.house, RentalHouse), self.listings.values()))
-
-        if BROCHURE_SIZE >= len(private_sector_listings):
-            return private_sector_listings
-
-        return random.sample(private_sector_listings, BROCHURE_SIZE)
+        return self.listings.sample(BROCHURE_SIZE, PRIVATE_SECTOR)
 
     @inject("rules")
     def get_social_brochure(self, year_income, household_size, rules):
         if (household_size == 1 and year_income > rules.max_income_one_person_household)\
                 or (household_size > 1 and year_income > rules.max_income_multi_person_household):
-            social_sector_listings = list(
-                filter(lambda listing: isinstance(listing.house, SocialHouse) and listing.no_income_limit,
-                       self.listings.values()))
-        else:
-            social_sector_listings = list(
-                filter(lambda listing: isinstance(listing.house, SocialHouse), self.listings.values()))
+            return self.listings.sample(BROCHURE_SIZE, NO_INCOME_LIMIT)
 
-        if BROCHURE_SIZE > len(social_sector_listings):
-            return social_sector_listings
-        else:
-            return random.sample(social_sector_listings, BROCHURE_SIZE)
+        return self.listings.sample(BROCHURE_SIZE, SOCIAL_SECTOR)
 
     def get_best_option_from_market(self, household):
         best_private_option = self.get_best_non_social_rent_option(household)
@@ -210,6 +274,10 @@ class SocialMarket(Market):
 
     def get_best_non_social_rent_option(self, household):
         brochure = self.get_brochure()
+
+        if self.batch_evaluation and len(brochure) >= MIN_BATCH_SIZE:
+            return self._get_best_option_from_brochure(household, brochure, _brochure_values(brochure))
+
         best_option = Option(None, -math.inf)
 
         for listing in brochure:
@@ -221,6 +289,10 @@ class SocialMarket(Market):
 
     def get_best_social_rent_option(self, household):
         brochure = self.get_social_brochure(household.income * len(MONTHS), household.size)
+
+        if self.batch_evaluation and len(brochure) >= MIN_BATCH_SIZE:
+            return self._get_best_option_from_brochure(household, brochure, _brochure_values(brochure))
+
         best_option = Option(None, -math.inf)
 
         for listing in brochure:
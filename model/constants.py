@@ -20,6 +20,9 @@ ESSENTIAL_COSTS = 400
 
 BROCHURE_SIZE = 10
 
+# Below this many utilities, building the arrays for a batch costs more than the scalar calls it replaces
+MIN_BATCH_SIZE = 48
+
 MORTGAGE_DURATION = 25
 MORTGAGE_INTEREST_RATE = 0.05
 ANNUITY_TABLE = {
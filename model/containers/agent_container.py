@@ -22,5 +22,8 @@ class AgentContainer:
     def __getitem__(self, key):
         return self._agents[key]
 
+    def __contains__(self, key):
+        return key in self._agents
+
     def __len__(self):
         return len(self._agents)
\ No newline at end of file
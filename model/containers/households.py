@@ -1,13 +1,23 @@
-import random
-
 from model.constants import MAX_AGE
 from model.containers.agent_container import AgentContainer
+from model.util.injector import Injector
+from model.util.random_streams import permutation_stream
+
+HOUSEHOLD_ORDER = permutation_stream('household_order', 'households')
 
 
 class Households(AgentContainer):
+    # Besides by id, households are indexed by (age, size) cohort, so the households of an age band and size
+    # can be found without a pass over all households. Sizes have to be changed with resize() to keep the
+    # index up to date. Added, resized and removed households are reported to the tax base of the model's
+    # government, if there is one, so households can also be kept without a model.
+    def __init__(self):
+        super().__init__()
+        self._cohorts = {}
+
     def tick(self, calibrate=False):
         households = list(self.values())
-        random.shuffle(households)
+        HOUSEHOLD_ORDER.shuffle(households)
 
         for household in households:
             if not calibrate:
@@ -18,6 +28,43 @@ class Households(AgentContainer):
             best_option = household.look_at_markets()
             household.act(best_option)
 
+    def add(self, agent):
+        if agent.id in self._agents:
+            self._remove_from_cohort(self._agents[agent.id])
+
+        super().add(agent)
+        self._add_to_cohort(agent)
+
+        tax_base = _tax_base()
+        if tax_base is not None:
+            tax_base.changed(agent)
+
+    def remove(self, agent):
+        super().remove(agent)
+        self._remove_from_cohort(agent)
+
+        tax_base = _tax_base()
+        if tax_base is not None:
+            tax_base.removed(agent)
+
+    def resize(self, household, size):
+        self._remove_from_cohort(household)
+        household.size = size
+        self._add_to_cohort(household)
+
+        # The size decides the rent allowance
+        tax_base = _tax_base()
+        if tax_base is not None:
+            tax_base.changed(household)
+
+    def in_cohort(self, min_age, max_age, size):
+        # Households with min_age <= age < max_age and the given size, ordered by id
+        households = [household for age in range(min_age, max_age)
+                      for household in self._cohorts.get((age, size), {}).values()]
+        households.sort(key=lambda household: household.id)
+
+        return households
+
     def age_one_year(self):
         too_old = []
         for household in self.values():
@@ -27,8 +74,32 @@ class Households(AgentContainer):
             if household.age >= MAX_AGE:
                 too_old.append(household)
 
+        self._age_cohorts()
         self.remove_all(too_old)
 
+    def _age_cohorts(self):
+        self._cohorts = {(age + 1, size): cohort for (age, size), cohort in self._cohorts.items()}
+
+    def _add_to_cohort(self, household):
+        key = (household.age, household.size)
+        if key not in self._cohorts:
+            self._cohorts[key] = {}
+
+        self._cohorts[key][household.id] = household
+
+    def _remove_from_cohort(self, household):
+        key = (household.age, household.size)
+        cohort = self._cohorts[key]
+        del cohort[household.id]
+
+        if len(cohort) == 0:
+            del self._cohorts[key]
+
     def assign_homelessness(self):
         for household in filter(lambda h: h.contract is None, self.values()):
             household.assign_homelessness()
+
+
+def _tax_base():
+    government = Injector.get('government')
+    return government.tax_base if government is not None else None
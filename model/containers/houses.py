@@ -1,21 +1,26 @@
 import math
-import random
 
-from scipy.stats import skewnorm
+import numpy as np
 
 from model.agents.house import RentalHouse, BuyHouse
 from model.constants import MIN_HOUSE_SIZE, MAX_HOUSE_SIZE, MIN_HOUSE_QUALITY, \
     MAX_HOUSE_QUALITY
 from model.containers.agent_container import AgentContainer
 from model.util.injector import inject
+from model.util.random_streams import skew_normal_stream, integer_stream, uniform_stream
 
+NEW_HOUSE_SIZES = skew_normal_stream('new_house_size', 'construction', 4.5, 80, 80)
+NEW_HOUSE_QUALITIES = integer_stream('new_house_quality', 'construction', MIN_HOUSE_QUALITY, MAX_HOUSE_QUALITY + 1)
+NEW_HOUSE_TENURES = uniform_stream('new_house_tenure', 'construction')
 
-def uniform_new_house_size_distribution():
-    return min(MAX_HOUSE_SIZE, max(MIN_HOUSE_SIZE, skewnorm.rvs(4.5, loc=80, size=1, scale=80)[0]))
 
+# Construction distributions take the number of houses to build and return an array with a value for each
+def uniform_new_house_size_distribution(count):
+    return np.clip(NEW_HOUSE_SIZES.next_batch(count), MIN_HOUSE_SIZE, MAX_HOUSE_SIZE)
 
-def uniform_new_house_quality_distribution():
-    return random.randint(MIN_HOUSE_QUALITY, MAX_HOUSE_QUALITY)
+
+def uniform_new_house_quality_distribution(count):
+    return NEW_HOUSE_QUALITIES.next_batch(count)
 
 
 class Houses(AgentContainer):
@@ -56,10 +61,7 @@ class Houses(AgentContainer):
 
         # print(year, ":", to_construct * run_settings.scale_factor, ",")
 
-        for _ in range(to_construct):
-            new_house = self.get_new_house()
-            self.add(new_house)
-            new_house.list()
+        self.build(to_construct)
 
     @inject("households")
     def calculate_housing_shortage(self, households):
@@ -68,11 +70,24 @@ class Houses(AgentContainer):
     def count_houses(self):
         return len(self)
 
-    def get_new_house(self):
-        size = self.size_distribution()
-        quality = self.quality_distribution()
+    def build(self, count):
+        if count <= 0:
+            return
+
+        sizes = self.size_distribution(count)
+        qualities = self.quality_distribution(count)
+        for_rent = NEW_HOUSE_TENURES.next_batch(count) <= self.percentage_for_rent
+
+        new_houses = [RentalHouse(size, quality) if is_for_rent else BuyHouse(size, quality)
+                      for size, quality, is_for_rent in zip(np.asarray(sizes).tolist(), np.asarray(qualities).tolist(),
+                                                             for_rent.tolist())]
+
+        for house in new_houses:
+            self.add(house)
 
-        if random.random() <= self.percentage_for_rent:
-            return RentalHouse(size, quality)
+        self._list_new_houses(new_houses)
 
-        return BuyHouse(size, quality)
+    @inject("buying_market", "rental_market")
+    def _list_new_houses(self, new_houses, buying_market, rental_market):
+        buying_market.list_new_houses([house for house in new_houses if isinstance(house, BuyHouse)])
+        rental_market.list_new_houses([house for house in new_houses if isinstance(house, RentalHouse)])
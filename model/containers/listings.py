@@ -0,0 +1,222 @@
+import bisect
+import collections.abc
+
+import numpy as np
+
+from model.util.random_streams import permutation_stream
+from model.util.rng import generator
+
+BROCHURE_SAMPLES = permutation_stream('brochures', 'markets')
+
+
+def sample_brochure_indices(number_of_brochures, number_of_listings, brochure_size):
+    # One row of distinct listing indices per brochure. Rows are drawn with replacement and the few rows
+    # that came out with a duplicate are redrawn exactly.
+    if brochure_size >= number_of_listings:
+        return np.tile(np.arange(number_of_listings), (number_of_brochures, 1))
+
+    indices = generator('markets').integers(number_of_listings, size=(number_of_brochures, brochure_size))
+
+    sorted_indices = np.sort(indices, axis=1)
+    with_duplicates = np.flatnonzero((sorted_indices[:, 1:] == sorted_indices[:, :-1]).any(axis=1))
+    if len(with_duplicates) > 0:
+        keys = generator('markets').random((len(with_duplicates), number_of_listings))
+        indices[with_duplicates] = np.argpartition(keys, brochure_size - 1, axis=1)[:, :brochure_size]
+
+    return indices
+
+
+class ListingPool:
+    # House ids of one kind of listing. Removal swaps the last id into the freed position, so adding,
+    # removing and indexing are all constant time.
+    def __init__(self):
+        self.house_ids = []
+        self._positions = {}
+
+    def add(self, house_id):
+        self._positions[house_id] = len(self.house_ids)
+        self.house_ids.append(house_id)
+
+    def remove(self, house_id):
+        position = self._positions.pop(house_id)
+        last = self.house_ids.pop()
+
+        if last != house_id:
+            self.house_ids[position] = last
+            self._positions[last] = position
+
+    def __len__(self):
+        return len(self.house_ids)
+
+
+class Listings(collections.abc.MutableMapping):
+    # Listings by house id. Every listing is also in a pool of all listings and in the named pools that
+    # pools_of(listing) puts it in, so brochures can be sampled without copying or filtering the listings.
+    # Pool methods called without pool names use the pool of all listings.
+    # With index_values, house ids are also kept sorted by value, to sample below a maximum value.
+    # decay() lowers the value of every listing for which decays(listing) holds to round(factor * value). It
+    # only advances a clock: a listing catches up on the decays it missed when it is read, with the same
+    # rounding at every step, and is stored back with its new value. The rounding never reorders values, so
+    # the index stays sorted across decays as long as every listing in it decays, and it is searched with the
+    # values of the listings it reads.
+    def __init__(self, pools_of=lambda listing: (), index_values=False, decays=lambda listing: False,
+                 decay_factor=1):
+        self._listings = {}
+        self._valued_at = {}
+        self._clock = 0
+        self._decays = decays
+        self._decay_factor = decay_factor
+
+        self._pools_of = pools_of
+        self._all = ListingPool()
+        self._pools = collections.defaultdict(ListingPool)
+
+        self._index_values = index_values
+        self._by_value = []
+
+    def __getitem__(self, house_id):
+        listing = self._listings[house_id]
+
+        missed_decays = self._clock - self._valued_at[house_id]
+        if missed_decays > 0:
+            if self._decays(listing):
+                listing = self._decayed(listing, missed_decays)
+                self._listings[house_id] = listing
+            self._valued_at[house_id] = self._clock
+
+        return listing
+
+    def __setitem__(self, house_id, listing):
+        pools = self._pools_of(listing)
+        index = self._index_values
+
+        if house_id in self._listings:
+            old_listing = self[house_id]
+            old_pools = self._pools_of(old_listing)
+            if old_pools != pools:
+                self._remove_from_pools(house_id, old_pools)
+                self._add_to_pools(house_id, pools)
+
+            if index and old_listing.value != listing.value:
+                self._remove_from_index(house_id, old_listing.value)
+            else:
+                index = False
+        else:
+            self._all.add(house_id)
+            self._add_to_pools(house_id, pools)
+
+        self._listings[house_id] = listing
+        self._valued_at[house_id] = self._clock
+
+        if index:
+            self._add_to_index(house_id, listing)
+
+    def __delitem__(self, house_id):
+        listing = self[house_id]
+        if self._index_values:
+            self._remove_from_index(house_id, listing.value)
+
+        del self._listings[house_id]
+        del self._valued_at[house_id]
+        self._all.remove(house_id)
+        self._remove_from_pools(house_id, self._pools_of(listing))
+
+    def __contains__(self, house_id):
+        return house_id in self._listings
+
+    def __iter__(self):
+        return iter(self._listings)
+
+    def __len__(self):
+        return len(self._listings)
+
+    def keys(self):
+        return self._listings.keys()
+
+    def values(self):
+        return [self[house_id] for house_id in self._listings]
+
+    def items(self):
+        return [(house_id, self[house_id]) for house_id in self._listings]
+
+    def decay(self):
+        self._clock += 1
+
+    def pool_size(self, *pool_names):
+        return sum(len(pool) for pool in self._named_pools(pool_names))
+
+    def in_pools(self, *pool_names):
+        return [self[house_id] for pool in self._named_pools(pool_names) for house_id in pool.house_ids]
+
+    def sample(self, number_of_listings, *pool_names):
+        # Draws positions in the pools laid end to end, so only the sampled listings are looked at.
+        pools = self._named_pools(pool_names)
+        pool_size = sum(len(pool) for pool in pools)
+        if number_of_listings >= pool_size:
+            return self.in_pools(*pool_names)
+
+        result = []
+        for position in BROCHURE_SAMPLES.sample(pool_size, number_of_listings):
+            for pool in pools:
+                if position < len(pool):
+                    result.append(self[pool.house_ids[position]])
+                    break
+                position -= len(pool)
+
+        return result
+
+    def sample_affordable(self, number_of_listings, max_value):
+        number_of_affordable = bisect.bisect_right(self._by_value, max_value, key=self._value_of)
+        if number_of_listings >= number_of_affordable:
+            positions = range(number_of_affordable)
+        else:
+            positions = BROCHURE_SAMPLES.sample(number_of_affordable, number_of_listings)
+
+        return [self[self._by_value[position]] for position in positions]
+
+    def sample_indices(self, number_of_brochures, brochure_size, *pool_names):
+        # A (number_of_brochures x brochure_size) matrix of positions in in_pools(*pool_names), with distinct
+        # positions in each row, drawn in one go for all brochures.
+        return sample_brochure_indices(number_of_brochures, self.pool_size(*pool_names), brochure_size)
+
+    def _named_pools(self, pool_names):
+        if len(pool_names) == 0:
+            return [self._all]
+
+        return [self._pools[name] for name in pool_names]
+
+    def _decayed(self, listing, number_of_decays):
+        value = listing.value
+        for _ in range(number_of_decays):
+            new_value = round(self._decay_factor * value)
+            if new_value == value:
+                break
+            value = new_value
+
+        return listing._replace(value=value)
+
+    def _value_of(self, house_id):
+        return self[house_id].value
+
+    def _add_to_index(self, house_id, listing):
+        # The index is searched by reading the values of the listings, so the listing must be stored first
+        if not self._decays(listing):
+            raise ValueError("Listings that do not decay cannot be indexed by value")
+
+        bisect.insort_right(self._by_value, house_id, key=self._value_of)
+
+    def _remove_from_index(self, house_id, value):
+        # Listings of equal value keep the order in which they were indexed, so the house is looked for among them
+        position = bisect.bisect_left(self._by_value, value, key=self._value_of)
+        while self._by_value[position] != house_id:
+            position += 1
+
+        del self._by_value[position]
+
+    def _add_to_pools(self, house_id, pools):
+        for name in pools:
+            self._pools[name].add(house_id)
+
+    def _remove_from_pools(self, house_id, pools):
+        for name in pools:
+            self._pools[name].remove(house_id)
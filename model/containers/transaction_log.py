@@ -0,0 +1,75 @@
+import collections
+
+import numpy as np
+
+Transactions = collections.namedtuple('Transactions', ['house_id', 'size', 'quality', 'value', 'wait_time', 'by',
+                                                       'sector'])
+
+TRANSACTION_COLUMNS = Transactions(house_id=np.int64, size=np.float64, quality=np.float64, value=np.float64,
+                                   wait_time=np.int64, by=np.int64, sector=np.int16)
+
+INITIAL_CAPACITY = 1024
+
+
+class TransactionLog:
+    # Append-only columns of transactions in the order they happened. Every year and month is a contiguous
+    # range of rows, so the last n transactions and the transactions of a year are slices of the columns.
+    # Sectors are stored as indices into self.sectors.
+    def __init__(self):
+        self._count = 0
+        self._capacity = INITIAL_CAPACITY
+        self._columns = Transactions(*[np.zeros(self._capacity, dtype=dtype) for dtype in TRANSACTION_COLUMNS])
+
+        self.sectors = []
+        self._sector_codes = {}
+
+        self._year_ranges = {}
+        self._month_ranges = {}
+
+    def append(self, transaction, year, month):
+        if self._count == self._capacity:
+            self._grow()
+
+        row = self._count
+        for column, value in zip(self._columns, transaction._replace(sector=self._sector_code(transaction.sector))):
+            column[row] = value
+        self._count += 1
+
+        self._extend_range(self._year_ranges, year, row)
+        self._extend_range(self._month_ranges, (year, month), row)
+
+    def last(self, number_of_transactions):
+        return self.rows(max(0, self._count - number_of_transactions), self._count)
+
+    def for_year(self, year):
+        return self.rows(*self._year_ranges.get(year, (0, 0)))
+
+    def for_month(self, year, month):
+        return self.rows(*self._month_ranges.get((year, month), (0, 0)))
+
+    def sector_names(self, transactions):
+        return [self.sectors[code] for code in transactions.sector]
+
+    def __len__(self):
+        return self._count
+
+    def rows(self, start, end):
+        return Transactions(*[column[start:end] for column in self._columns])
+
+    def _sector_code(self, sector):
+        if sector not in self._sector_codes:
+            self._sector_codes[sector] = len(self.sectors)
+            self.sectors.append(sector)
+
+        return self._sector_codes[sector]
+
+    @staticmethod
+    def _extend_range(ranges, key, row):
+        if key in ranges:
+            ranges[key][1] = row + 1
+        else:
+            ranges[key] = [row, row + 1]
+
+    def _grow(self):
+        self._capacity *= 2
+        self._columns = Transactions(*[np.resize(column, self._capacity) for column in self._columns])
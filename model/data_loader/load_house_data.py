@@ -0,0 +1,20 @@
+import csv
+import functools
+import types
+
+
+# The tables are read once per process and shared by the house factories of all runs, so they are
+# returned read-only: a mapping proxy of the years to tuples of counts.
+@functools.lru_cache(maxsize=None)
+def load_house_data(path):
+    result = {}
+    with open(path, 'r', encoding='utf-8-sig') as file:
+        reader = csv.reader(file, delimiter=';')
+        next(reader)
+
+        for row in reader:
+            # skip the region, convert the year and the counts to integers
+            [year, *counts] = list(map(int, row[1:]))
+            result[year] = tuple(counts)
+
+    return types.MappingProxyType(result)
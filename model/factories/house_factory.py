@@ -1,11 +1,10 @@
 import collections
-import random
-
-import pandas as pd
 
 from model.agents.house import RentalHouse, BuyHouse
 from model.constants import MIN_HOUSE_SIZE, MAX_HOUSE_SIZE, MIN_HOUSE_QUALITY, MAX_HOUSE_QUALITY
 from model.containers.houses import Houses
+from model.data_loader.load_house_data import load_house_data
+from model.util.rng import generator
 
 HouseSizeGroup = collections.namedtuple('HouseSizeGroup', ['min_m2', 'max_m2'])
 
@@ -18,30 +17,33 @@ HOUSE_SIZE_GROUPS = [HouseSizeGroup(MIN_HOUSE_SIZE, 15), HouseSizeGroup(15, 50),
 
 class HouseFactory:
     def __init__(self):
-        self.houses_by_size_per_year = pd.read_csv("data/houses_by_size_per_year.csv", sep=";")
-        self.house_purpose_per_year = pd.read_csv("data/house_purpose_data.csv", sep=";")
+        self.houses_by_size_per_year = load_house_data("data/houses_by_size_per_year.csv")
+        self.house_purpose_per_year = load_house_data("data/house_purpose_data.csv")
 
     def create_houses(self, year, initial_portion_houses_for_rent, scale_factor=1):
-        data_for_year = self.houses_by_size_per_year[
-                            self.houses_by_size_per_year["Year"] == year].iloc[:, 2:]
-        row_index_for_year = data_for_year.index[0]
-
-        purpose_data_for_year = self.house_purpose_per_year[
-                                    self.house_purpose_per_year["Year"] == year].iloc[:, 2:]
-        purpose_total = purpose_data_for_year.sum(axis=1).iloc[0] if initial_portion_houses_for_rent is None else 100
-        purpose_buy = purpose_data_for_year.iloc[0, 0] if initial_portion_houses_for_rent is None \
+        data_for_year = self.houses_by_size_per_year[year]
+
+        purpose_data_for_year = self.house_purpose_per_year[year]
+        purpose_total = sum(purpose_data_for_year) if initial_portion_houses_for_rent is None else 100
+        purpose_buy = purpose_data_for_year[0] if initial_portion_houses_for_rent is None \
             else 100 * (1 - initial_portion_houses_for_rent)
 
         houses = Houses()
 
-        for (i, header) in enumerate(data_for_year):
-            house_size_group = HOUSE_SIZE_GROUPS[i]
-            scaled_number_of_households_in_group = round(data_for_year.loc[row_index_for_year, header] / scale_factor)
+        for house_size_group, number_of_houses in zip(HOUSE_SIZE_GROUPS, data_for_year):
+            scaled_number_of_houses_in_group = round(number_of_houses / scale_factor)
+
+            # Sizes, qualities and purposes of the whole group are drawn at once
+            random_state = generator('factories')
+            sizes = random_state.integers(house_size_group.min_m2, house_size_group.max_m2,
+                                          size=scaled_number_of_houses_in_group)
+            qualities = random_state.integers(MIN_HOUSE_QUALITY, MAX_HOUSE_QUALITY + 1,
+                                              size=scaled_number_of_houses_in_group)
+            for_sale = random_state.integers(0, purpose_total + 1,
+                                             size=scaled_number_of_houses_in_group) < purpose_buy
 
-            for _ in range(scaled_number_of_households_in_group):
-                size = random.randint(house_size_group.min_m2, house_size_group.max_m2 - 1)
-                quality = random.randint(MIN_HOUSE_QUALITY, MAX_HOUSE_QUALITY)
-                if random.randint(0, purpose_total) < purpose_buy:
+            for size, quality, is_for_sale in zip(sizes.tolist(), qualities.tolist(), for_sale.tolist()):
+                if is_for_sale:
                     houses.add(BuyHouse(size, quality))
                 else:
                     houses.add(RentalHouse(size, quality))
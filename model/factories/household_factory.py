@@ -1,15 +1,20 @@
 import math
-import random
 
-from model.agents.household import Household, new_timeline_entry
+import numpy as np
+
+from model.agents.household import Household, new_timeline_entry, current_utilities_around
 from model.constants import MONTHS, MIN_AGE, MAX_AGE, MIN_HOUSEHOLD_SIZE, MAX_HOUSEHOLD_SIZE
 from model.containers.households import Households
 from model.data_loader.load_household_data import load_household_data
 from model.data_loader.load_money_data import load_money_data
+from model.util.random_streams import permutation_stream
+from model.util.rng import generator
 from model.util.skewed_distribution import skewed_distribution
 
 LAST_YEAR_WITH_INCOME_DATA = 2020
 
+DEATHS = permutation_stream('deaths', 'households')
+
 
 def age_to_bottom_of_age_group(age):
     min_age = 5 * math.floor(age / 5)
@@ -23,20 +28,35 @@ def age_to_bottom_of_age_group(age):
     return min_age
 
 
-def get_money(age, percentile, data):
-    min_age = age_to_bottom_of_age_group(age)
-    max_age = 100 if min_age == 85 else min_age + 10
+def get_money_batch(ages, percentiles, data):
+    # The bracket of a percentile is the first one whose cumulative percentile reaches it, or the last one.
+    # Brackets are found with searchsorted on the cumulative percentiles of each age group, and all members of
+    # a bracket share one skewed draw.
+    ages = np.asarray(ages)
+    percentiles = np.asarray(percentiles, dtype=float)
+
+    unique_ages, age_indices = np.unique(ages, return_inverse=True)
+    bottoms = np.array([age_to_bottom_of_age_group(age) for age in unique_ages.tolist()], dtype=np.int64)
+    bottoms = bottoms[age_indices]
 
-    total_percentile = 0
-    for group_percentile, mean_val, median in data[(min_age, max_age)]:
-        if percentile <= total_percentile + group_percentile:
-            return round(skewed_distribution(
-                mean_val * 1000, median * 1000))
+    money = np.zeros(len(ages), dtype=np.int64)
+    for min_age in np.unique(bottoms).tolist():
+        max_age = 100 if min_age == 85 else min_age + 10
+        brackets = data[(min_age, max_age)]
+        in_group = np.flatnonzero(bottoms == min_age)
 
-        total_percentile += group_percentile
+        upper_percentiles = np.cumsum([group_percentile for group_percentile, _, _ in brackets])
+        bracket_indices = np.minimum(np.searchsorted(upper_percentiles, percentiles[in_group], side='left'),
+                                     len(brackets) - 1)
 
-    _, mean_val, median = data[(min_age, max_age)][-1]
-    return round(skewed_distribution(mean_val * 1000, median * 1000))
+        for bracket_index in np.unique(bracket_indices).tolist():
+            _, mean_val, median = brackets[bracket_index]
+            members = in_group[bracket_indices == bracket_index]
+            draws = skewed_distribution(mean_val * 1000, median * 1000, size=len(members),
+                                        random_state=generator('factories'))
+            money[members] = np.round(np.atleast_1d(draws))
+
+    return money
 
 
 class HouseholdFactory:
@@ -58,15 +78,10 @@ class HouseholdFactory:
                 if rounded_scaled_count == 0:
                     rest_households += scaled_count
 
-                for _ in range(rounded_scaled_count):
-                    household = self._create_household(min_age, max_age, size, year)
-
+                for household in self._create_households(min_age, max_age, size, year, rounded_scaled_count):
                     households.add(household)
 
-        for _ in range(round(rest_households)):
-            size = random.randint(MIN_HOUSEHOLD_SIZE, MAX_HOUSEHOLD_SIZE)
-            household = self._create_household(MIN_AGE, MAX_AGE, size, year)
-
+        for household in self._create_households_of_random_size(MIN_AGE, MAX_AGE, year, round(rest_households)):
             households.add(household)
 
         return households
@@ -82,10 +97,7 @@ class HouseholdFactory:
             for size in self.household_data[model.year][(min_age, max_age)]:
                 expected_count = self.household_data[model.year][(min_age, max_age)][size]
 
-                households_in_group = list(filter(
-                    lambda h: min_age <= h.age < max_age and
-                              h.size == size,
-                    model.households.values()))
+                households_in_group = model.households.in_cohort(min_age, max_age, size)
 
                 current_number_of_households_in_group = len(households_in_group) * model.run_settings.scale_factor
                 difference = expected_count - current_number_of_households_in_group
@@ -97,7 +109,8 @@ class HouseholdFactory:
                 scaled_difference = round(scaled_difference)
 
                 if scaled_difference < 0:
-                    to_die_households = random.sample(households_in_group, abs(scaled_difference))
+                    to_die_households = [households_in_group[index] for index in
+                                         DEATHS.sample(len(households_in_group), abs(scaled_difference))]
                     to_die.extend(to_die_households)
 
                     # model.households.remove_all(died_households)
@@ -106,57 +119,106 @@ class HouseholdFactory:
                     # for _ in range(scaled_difference):
                     #     model.households.add(self._create_household(min_age, max_age, size, model.year))
 
+            resized = []
+
             for new_size, amount in to_create:
+                number_to_create = 0
+
                 while amount > 0:
                     if len(to_die) > 0:
-                        household = to_die.pop()
-
-                        before_utility = household.current_utility()
-                        # TODO: Check if size is updated in model.households
-                        household.size = new_size
-                        after_utility = household.current_utility()
-
-                        if after_utility < before_utility:
-                            household.contract.want_to_move = True
-
-                        size_info = {'type': 'SIZE_CHANGE', 'size': household.size,
-                                     'age': household.age,
-                                     'want_to_move': household.contract.want_to_move}
-                        household.timeline.append(new_timeline_entry(size_info))
+                        resized.append((to_die.pop(), new_size))
                     else:
-                        model.households.add(self._create_household(min_age, max_age, new_size, model.year))
+                        number_to_create += 1
 
                     amount -= 1
 
+                for household in self._create_households(min_age, max_age, new_size, model.year, number_to_create):
+                    model.households.add(household)
+
+            if len(resized) > 0:
+                self._resize_households(model, resized)
+
             model.households.remove_all(to_die)
 
         rest_households = round(rest_households)
         if rest_households < 0:
             existing_households = [h for h in model.households.values() if h.contract is not None]
 
-            died_households = random.sample(existing_households, abs(rest_households))
+            died_households = [existing_households[index] for index in
+                               DEATHS.sample(len(existing_households), abs(rest_households))]
             model.households.remove_all(died_households)
         elif rest_households > 0:
-            for _ in range(rest_households):
-                size = random.randint(MIN_HOUSEHOLD_SIZE, MAX_HOUSEHOLD_SIZE)
-                household = self._create_household(MIN_AGE, MAX_AGE, size, model.year)
+            for household in self._create_households_of_random_size(MIN_AGE, MAX_AGE, model.year, rest_households):
                 model.households.add(household)
 
+    def _resize_households(self, model, resized):
+        # Creating households draws from other streams than the random utility terms, so resizing after the
+        # new households of the age group are made keeps the draws of the utilities the same
+        households = [household for household, _ in resized]
+        new_sizes = {household.id: new_size for household, new_size in resized}
+
+        def resize(household):
+            model.households.resize(household, new_sizes[household.id])
+
+        if model.run_settings.batch_utility:
+            before_utilities, after_utilities = current_utilities_around(households, resize)
+        else:
+            before_utilities, after_utilities = [], []
+            for household in households:
+                before_utilities.append(household.current_utility())
+                resize(household)
+                after_utilities.append(household.current_utility())
+
+        for household, before_utility, after_utility in zip(households, before_utilities, after_utilities):
+            self._record_size_change(household, after_utility < before_utility)
+
+    @staticmethod
+    def _record_size_change(household, worse_off):
+        if worse_off:
+            household.contract.want_to_move = True
+
+        size_info = {'type': 'SIZE_CHANGE', 'size': household.size,
+                     'age': household.age,
+                     'want_to_move': household.contract.want_to_move}
+        household.timeline.append(new_timeline_entry(size_info))
+
     def update_incomes(self, year, households):
-        income_data = self._income_data(year)
+        households = list(households.values())
+        ages = np.array([household.age for household in households], dtype=np.int64)
+        percentiles = np.array([household.income_percentile for household in households], dtype=float)
+
+        incomes = self._monthly_incomes(ages, percentiles, year)
+
+        for household, income in zip(households, incomes.tolist()):
+            household.income = income
+
+    def _create_households(self, min_age, max_age, size, year, count):
+        ages = generator('factories').integers(min_age, max_age, size=count)
+        percentiles = generator('factories').random(count)
 
-        for household in households.values():
-            new_income = round(get_money(household.age, household.income_percentile, income_data) / len(MONTHS))
-            household.income = new_income
+        incomes = self._monthly_incomes(ages, percentiles, year)
+        wealths = get_money_batch(ages, percentiles, self._wealth_data(year))
 
-    def _create_household(self, min_age, max_age, size, year):
-        age = random.randint(min_age, max_age - 1)
-        percentile = random.random()
+        return [Household(age, size, percentile, income, wealth) for age, percentile, income, wealth
+                in zip(ages.tolist(), percentiles.tolist(), incomes.tolist(), wealths.tolist())]
 
-        income = round(get_money(age, percentile, self._income_data(year)) / len(MONTHS))
-        wealth = get_money(age, percentile, self._wealth_data(year))
+    def _monthly_incomes(self, ages, percentiles, year):
+        incomes = np.round(get_money_batch(ages, percentiles, self._income_data(year)) / len(MONTHS))
 
-        return Household(age, size, percentile, income, wealth)
+        return self._adjust_incomes(incomes.astype(np.int64))
+
+    def _adjust_incomes(self, incomes):
+        # Hook for policies that change every monthly income, of new households and at the yearly update alike
+        return incomes
+
+    def _create_households_of_random_size(self, min_age, max_age, year, count):
+        sizes = generator('factories').integers(MIN_HOUSEHOLD_SIZE, MAX_HOUSEHOLD_SIZE + 1, size=count)
+
+        households = []
+        for size in np.unique(sizes).tolist():
+            households += self._create_households(min_age, max_age, size, year, int(np.count_nonzero(sizes == size)))
+
+        return households
 
     def _income_data(self, year):
         if year <= LAST_YEAR_WITH_INCOME_DATA:
@@ -0,0 +1,159 @@
+import math
+
+import numpy as np
+
+from model.agents.bank import Bank
+from model.agents.house import HouseArrays, house_arrays
+from model.agents.household import HouseholdArrays, household_arrays, is_stock
+from model.agents.market import Option, PRIVATE_SECTOR, SOCIAL_SECTOR, BuyingMarket, SocialMarket
+from model.constants import MONTHS, BROCHURE_SIZE
+from model.containers.households import HOUSEHOLD_ORDER
+from model.containers.listings import sample_brochure_indices
+from model.util.injector import inject
+
+NO_LISTING = -1
+
+# The matrix search repeats the brochure search of these model components with arrays, so it is only used
+# while they are of these types and no policy replaced the methods it repeats
+STOCK_COMPONENTS = {'buying_market': BuyingMarket, 'rental_market': SocialMarket, 'bank': Bank}
+STOCK_METHODS = {(component_type, name): getattr(component_type, name) for component_type, names in [
+    (BuyingMarket, ['get_best_option_from_market', 'get_brochure']),
+    (SocialMarket, ['get_best_option_from_market', 'get_best_non_social_rent_option',
+                    'get_best_social_rent_option', 'get_brochure', 'get_social_brochure']),
+    (Bank, ['max_bid', 'max_bids', 'value_to_monthly_payment', 'values_to_monthly_payments', 'monthly_payments']),
+] for name in names}
+
+
+def replaced_components(model):
+    # The components and methods the matrix search would ignore. A replaced utility __call__ or
+    # Household.left_over_money is handled by Utility.score.
+    replaced = ["{} ({})".format(name, type(getattr(model, name)).__name__)
+                for name, component_type in STOCK_COMPONENTS.items()
+                if type(getattr(model, name)) is not component_type]
+    replaced += ["{}.{}".format(component_type.__name__, name) for (component_type, name), method
+                 in STOCK_METHODS.items() if getattr(component_type, name) is not method]
+    replaced += ["Household.{}".format(name) for name in ['utility', 'look_at_markets'] if not is_stock(name)]
+
+    return replaced
+
+
+class ListingSnapshot:
+    def __init__(self, market, listings):
+        self.market = market
+        self.listings = listings
+        self.houses = house_arrays([listing.house for listing in listings])
+        self.values = np.array([listing.value for listing in listings], dtype=float)
+
+    def __len__(self):
+        return len(self.listings)
+
+    def is_available(self, index):
+        house = self.listings[index].house
+        return house.id in self.market.listings and self.market.listings[house.id].house is house
+
+
+class BrochureBlock:
+    def __init__(self, snapshot, indices):
+        self.snapshot = snapshot
+        self.indices = indices
+
+    def score(self, households, utility, costs_of=None, affordable=None):
+        safe_indices = np.where(self.indices == NO_LISTING, 0, self.indices)
+        houses = HouseArrays(*[field[safe_indices] for field in self.snapshot.houses])
+        values = self.snapshot.values[safe_indices]
+
+        costs = values if costs_of is None else costs_of(values)
+        moving = houses.id != households.house_id
+        utilities = utility.score(households, houses, costs, moving)
+
+        unavailable = self.indices == NO_LISTING
+        if affordable is not None:
+            unavailable |= values > affordable
+        utilities[unavailable] = -math.inf
+
+        return utilities
+
+
+def _pad(indices, width):
+    padding = np.full((indices.shape[0], width - indices.shape[1]), NO_LISTING)
+    return np.hstack([indices, padding])
+
+
+@inject("buying_market", "rental_market", "bank", "rules", "parameters")
+def matrix_market_search(households, calibrate, buying_market, rental_market, bank, rules, parameters):
+    # Same steps as Households.tick, but the brochures of all households are drawn up front as
+    # (households x BROCHURE_SIZE) index matrices and scored in one vectorized pass per market.
+    # Households then act one by one in the shuffled order.
+    households = list(households.values())
+    HOUSEHOLD_ORDER.shuffle(households)
+
+    for household in households:
+        if not calibrate:
+            household.gain_wealth()
+
+        household.update_contract()
+
+    contracts = [household.contract for household in households]
+    number_of_households = len(households)
+
+    members = household_arrays(households)
+    members_column = HouseholdArrays(*[field[:, np.newaxis] for field in members])
+
+    buy = ListingSnapshot(buying_market, buying_market.listings.in_pools())
+    private = ListingSnapshot(rental_market, rental_market.listings.in_pools(PRIVATE_SECTOR))
+    social = ListingSnapshot(rental_market, rental_market.listings.in_pools(SOCIAL_SECTOR))
+
+    yearly_incomes = members.income * len(MONTHS)
+    over_income_limit = ((members.size == 1) & (yearly_incomes > rules.max_income_one_person_household)) | \
+                        ((members.size > 1) & (yearly_incomes > rules.max_income_multi_person_household))
+    no_income_limit = np.flatnonzero([listing.no_income_limit for listing in social.listings])
+
+    all_social_indices = rental_market.listings.sample_indices(number_of_households, BROCHURE_SIZE, SOCIAL_SECTOR)
+    limited_social_indices = no_income_limit[sample_brochure_indices(number_of_households, len(no_income_limit),
+                                                                     BROCHURE_SIZE)]
+    social_width = max(all_social_indices.shape[1], limited_social_indices.shape[1])
+    social_indices = np.where(over_income_limit[:, np.newaxis],
+                              _pad(limited_social_indices, social_width),
+                              _pad(all_social_indices, social_width))
+
+    blocks = [BrochureBlock(buy, buying_market.listings.sample_indices(number_of_households, BROCHURE_SIZE)),
+              BrochureBlock(private, rental_market.listings.sample_indices(number_of_households, BROCHURE_SIZE,
+                                                                           PRIVATE_SECTOR)),
+              BrochureBlock(social, social_indices)]
+
+    max_bids = bank.max_bids(members.income, members.wealth)
+    utilities = np.hstack([
+        blocks[0].score(members_column, parameters.utility,
+                        costs_of=lambda values: bank.monthly_payments(values, members_column.wealth),
+                        affordable=max_bids[:, np.newaxis]),
+        blocks[1].score(members_column, parameters.utility),
+        blocks[2].score(members_column, parameters.utility),
+    ])
+
+    block_ends = np.cumsum([block.indices.shape[1] for block in blocks])
+
+    for row, household in enumerate(households):
+        best_option = _best_option(utilities[row], blocks, block_ends, row)
+
+        # Someone else changed this household's contract (its house was sold), or an earlier household took
+        # the listing it liked best: search again on the current markets, as the sequential tick would.
+        if household.contract is not contracts[row] or best_option is None:
+            best_option = household.look_at_markets()
+
+        household.act(best_option)
+
+
+def _best_option(utilities, blocks, block_ends, row):
+    column = int(np.argmax(utilities))
+    if utilities[column] == -math.inf:
+        return Option(None, -math.inf)
+
+    block_number = int(np.searchsorted(block_ends, column, side='right'))
+    block = blocks[block_number]
+    block_start = block_ends[block_number - 1] if block_number > 0 else 0
+    index = block.indices[row, column - block_start]
+
+    if not block.snapshot.is_available(index):
+        return None
+
+    return Option(block.snapshot.listings[index].house, utilities[column])
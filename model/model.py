@@ -7,7 +7,10 @@ from model.agents.government import Government
 from model.agents.household import new_timeline_entry
 from model.agents.market import SocialMarket, BuyingMarket
 from model.constants import MONTHS, MIN_BUYING_PRICE, MIN_RENTAL_PRICE
+from model.matrix_search import matrix_market_search, replaced_components
 from model.util.injector import Injector
+from model.util.random_streams import reset_streams
+from model.util.rng import seed_generators
 
 State = collections.namedtuple('State', ["year", "month", "households", "houses", "buy_listings",
                                          "rent_listings", "buying_transactions", "rental_transactions"])
@@ -17,9 +20,16 @@ Hooks = collections.namedtuple('Hooks', ['post_init', 'end_of_year', 'post_creat
 
 class Model:
     def __init__(self, run_settings, parameters, rules, household_factory, house_factory, data_collectors=None,
-                 collector_groups=None, individual_collectors=None, hooks=Hooks()):
+                 collector_groups=None, individual_collectors=None, hooks=Hooks(), seed_sequence=None):
         Injector.set_model(self)
 
+        # The runner passes the SeedSequence of this run; a model made on its own is seeded with the master seed
+        if seed_sequence is None and run_settings.seed is not None:
+            seed_sequence = np.random.SeedSequence(run_settings.seed)
+        if seed_sequence is not None:
+            seed_generators(seed_sequence)
+            reset_streams()
+
         self.run_settings = run_settings
         self.parameters = parameters
         self.rules = rules
@@ -31,12 +41,15 @@ class Model:
         self.house_factory = house_factory
 
         self.bank = Bank()
-        self.government = Government()
+        self.government = Government(liberalisation_threshold=rules.liberalisation_threshold)
 
         self.buying_market = BuyingMarket(*self.parameters.buy_market_price_params,
-                                          min_price=MIN_BUYING_PRICE, max_price=rules.max_buy_price)
+                                          min_price=MIN_BUYING_PRICE, max_price=rules.max_buy_price,
+                                          batch_evaluation=run_settings.batch_utility,
+                                          affordable_brochures=run_settings.affordable_brochures)
         self.rental_market = SocialMarket(*self.parameters.rent_market_price_params,
-                                          min_price=MIN_RENTAL_PRICE, max_price=rules.max_rent_price)
+                                          min_price=MIN_RENTAL_PRICE, max_price=rules.max_rent_price,
+                                          batch_evaluation=run_settings.batch_utility)
 
         self.history = []
 
@@ -44,6 +57,11 @@ class Model:
         for hook in self.hooks.post_init:
             hook(self)
 
+        # The matrix search falls back to the household loop if a hook or policy replaced a component it
+        # does not support. Those components are kept in matrix_search_unsupported.
+        self.matrix_search_unsupported = replaced_components(self) if run_settings.matrix_search else []
+        self.matrix_search = run_settings.matrix_search and len(self.matrix_search_unsupported) == 0
+
         self.data_collectors = data_collectors if data_collectors is not None else []
         self.collector_groups = collector_groups if collector_groups is not None else []
 
@@ -95,6 +113,8 @@ class Model:
                 for hook in self.hooks.end_of_year:
                     hook(self)
 
+                self.government.tax_base.invalidate()
+
                 self.houses.construct()
 
         for household_id in self.tracked_individuals:
@@ -146,7 +166,10 @@ class Model:
         self.buying_market.fit_market_price_parameters()
         self.rental_market.fit_market_price_parameters()
 
-        self.households.tick(calibrate)
+        if self.matrix_search:
+            matrix_market_search(self.households, calibrate)
+        else:
+            self.households.tick(calibrate)
 
         self.buying_market.update()
         self.rental_market.update()
@@ -157,6 +180,7 @@ class Model:
         self.households.age_one_year()
         self.household_factory.balance_households(self)
         self.household_factory.update_incomes(self.year, self.households)
+        self.government.tax_base.invalidate()
 
     def _list_houses(self):
         for house in self.houses.values():
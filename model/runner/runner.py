@@ -1,6 +1,8 @@
 import collections
+import concurrent.futures
 import json
 import math
+import multiprocessing
 
 import numpy as np
 
@@ -10,9 +12,13 @@ from model.defaults import DEFAULT_CONSTRUCTION_RULES, DEFAULT_LIBERALISATION_TH
 from model.factories.house_factory import HouseFactory
 from model.factories.household_factory import HouseholdFactory
 from model.model import Model, Hooks
+from model.util.rng import run_seed_sequences
 
 RunSettings = collections.namedtuple('RunSettings', ['start_year', 'end_year', 'scale_factor',
-                                                     'calibration_length', 'number_of_runs'])
+                                                     'calibration_length', 'number_of_runs',
+                                                     'batch_utility', 'matrix_search', 'check_tax_base',
+                                                     'affordable_brochures', 'seed'],
+                                     defaults=[False, False, False, False, None])
 
 Parameters = collections.namedtuple('Parameters', ["utility", "buy_market_price_params",
                                                    "rent_market_price_params"])
@@ -29,7 +35,8 @@ Rules = collections.namedtuple('Rules', ["construction",
                                          "max_buy_price",
                                          "max_rent_price",
                                          "constant_price",
-                                         "basic_income_amount"],
+                                         "basic_income_amount",
+                                         "liberalisation_threshold"],
                                defaults=[DEFAULT_CONSTRUCTION_RULES,
                                          None,
                                          DEFAULT_MAX_INCOME_ONE_PERSON_HOUSEHOLD,
@@ -42,13 +49,66 @@ Rules = collections.namedtuple('Rules', ["construction",
                                          math.inf,
                                          math.inf,
                                          None,
-                                         None])
+                                         None,
+                                         DEFAULT_LIBERALISATION_THRESHOLD])
+
+
+class RunFailed(RuntimeError):
+    def __init__(self, run_number, model_name=""):
+        if model_name:
+            super().__init__("Run {} of {} failed".format(run_number + 1, model_name))
+        else:
+            super().__init__("Run {} failed".format(run_number + 1))
+
+        self.run_number = run_number
+        self.model_name = model_name
+
+
+# The runners of the jobs in the pool, read by forked workers from the memory they share with the parent,
+# so policy functions and monkeypatches do not have to be pickled.
+_forked_runners = None
+
+
+def _run_in_worker(runner_index, run_number, seed_sequence):
+    return _forked_runners[runner_index]._run_one(run_number, seed_sequence)
+
+
+def run_jobs(runners, jobs, workers=1):
+    # Runs (runner index, run number, seed sequence) jobs and yields (runner index, run number, (data, tracked
+    # individuals)) as they finish: in job order with one worker, in order of completion in a pool of at most
+    # one worker per job.
+    workers = min(workers, len(jobs))
+    if workers <= 1:
+        for runner_index, run_number, seed_sequence in jobs:
+            yield runner_index, run_number, runners[runner_index]._run_one(run_number, seed_sequence)
+        return
+
+    global _forked_runners
+    _forked_runners = runners
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                    mp_context=multiprocessing.get_context('fork')) as pool:
+            futures = {pool.submit(_run_in_worker, *job): job for job in jobs}
+
+            for future in concurrent.futures.as_completed(futures):
+                runner_index, run_number, _ = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exception:
+                    for remaining in futures:
+                        remaining.cancel()
+                    raise RunFailed(run_number, runners[runner_index].model_name) from exception
+
+                yield runner_index, run_number, result
+    finally:
+        _forked_runners = None
 
 
 class Runner:
     def __init__(self, run_settings, parameters, rules, data_collectors=None,
                  collector_groups=None, individual_collectors=None, hooks=Hooks(),
-                 model_name=""):
+                 model_name="", workers=1):
         self.run_settings = run_settings
         self.parameters = parameters
         self.rules = rules
@@ -57,23 +117,43 @@ class Runner:
         self.collector_groups = collector_groups
         self.individual_collectors = individual_collectors
         self.model_name = model_name
+        self.workers = workers
 
         self.runs = []
+        self.tracked_individuals = []
 
     def run(self):
-        for run_number in range(self.run_settings.number_of_runs):
-            print("Run {}".format(run_number + 1))
-            Agent.reset_id_iter()
-            model = Model(self.run_settings, self.parameters, self.rules, HouseholdFactory(), HouseFactory(),
-                          data_collectors=self.data_collectors, collector_groups=self.collector_groups,
-                          individual_collectors=self.individual_collectors, hooks=self.hooks)
+        # Results are kept in run order, whatever order the workers finish in
+        finished = {}
+        for _, run_number, result in run_jobs([self], self.jobs(), self.workers):
+            finished[run_number] = result
+
+            while len(self.runs) in finished:
+                self._add_run(*finished.pop(len(self.runs)))
+
+    def jobs(self, runner_index=0):
+        seed_sequences = run_seed_sequences(self.run_settings.seed, self.run_settings.number_of_runs)
+
+        return [(runner_index, run_number, seed_sequence) for run_number, seed_sequence in enumerate(seed_sequences)]
+
+    def _add_run(self, data, tracked_individuals):
+        with open('output_data/one_run_data/{}-individuals.json'.format(self.model_name), 'w') as file:
+            json.dump(tracked_individuals, file)
+
+        self.runs.append(data)
+        self.tracked_individuals.append(tracked_individuals)
 
-            model.run()
+    def _run_one(self, run_number, seed_sequence):
+        print("Run {}".format(run_number + 1))
+        Agent.reset_id_iter()
+        model = Model(self.run_settings, self.parameters, self.rules, HouseholdFactory(), HouseFactory(),
+                      data_collectors=self.data_collectors, collector_groups=self.collector_groups,
+                      individual_collectors=self.individual_collectors, hooks=self.hooks,
+                      seed_sequence=seed_sequence)
 
-            with open('output_data/one_run_data/{}-individuals.json'.format(self.model_name), 'w') as file:
-                json.dump(model.tracked_individuals, file)
+        model.run()
 
-            self.runs.append(model.data)
+        return model.data, model.tracked_individuals
 
     # def average_over_runs(self, data_collector, by_year=False, take="mean"):
     #     step = 12 if by_year else 1
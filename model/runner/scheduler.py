@@ -0,0 +1,181 @@
+import collections
+import concurrent.futures
+import importlib
+import json
+import multiprocessing
+import os
+import time
+import traceback
+
+from model.runner.runner import Runner
+from model.runner.sweep import Sweep
+from model.util.rng import run_seed_sequences
+
+# Files that every policy's output depends on, besides the policy module itself
+SOURCE_DIRECTORIES = ['model', 'extensions', 'data']
+SHARED_POLICY_SOURCES = ['policies/run_settings.py']
+
+# A variant of a policy module that has to be run. Only its name and run settings are known to the parent: the
+# rules, parameters and hooks stay in the worker processes that import the policy module.
+PolicyVariant = collections.namedtuple('PolicyVariant', ['policy', 'runner_index', 'model_name', 'run_settings',
+                                                         'output_path'])
+
+
+def discover_policies(directories):
+    # Module names of the policy scripts in the given directories of policies/
+    policies = []
+    for directory in directories:
+        for file_name in sorted(os.listdir(os.path.join('policies', directory))):
+            name, extension = os.path.splitext(file_name)
+            if extension == '.py' and name != '__init__':
+                policies.append('policies.{}.{}'.format(directory, name))
+
+    return policies
+
+
+def policy_runners(module):
+    # One runner per variant of a module level sweep, or the module level runner of a single policy model
+    sweep = getattr(module, 'sweep', None)
+    if isinstance(sweep, Sweep):
+        return sweep.runners
+
+    runner = getattr(module, 'model', None)
+    if isinstance(runner, Runner):
+        if not runner.model_name:
+            runner.model_name = module.__name__.rsplit('.', 1)[-1]
+        return [runner]
+
+    return []
+
+
+# Policy modules monkeypatch the model when they are imported, so they are only imported by these jobs, each in
+# a fresh process, and the patches of one policy neither leak into the parent nor into other policies.
+
+def _describe_policy(policy):
+    module = importlib.import_module(policy)
+    return module.__file__, [(runner.model_name, runner.run_settings) for runner in policy_runners(module)]
+
+
+def _run_policy_job(policy, runner_index, run_number, seed_sequence):
+    module = importlib.import_module(policy)
+    return policy_runners(module)[runner_index]._run_one(run_number, seed_sequence)
+
+
+def _fresh_process_pool(workers, number_of_jobs):
+    return concurrent.futures.ProcessPoolExecutor(max_workers=max(1, min(workers, number_of_jobs)),
+                                                  mp_context=multiprocessing.get_context('spawn'),
+                                                  max_tasks_per_child=1)
+
+
+def _newest_modification_time(paths):
+    newest = 0
+    for path in paths:
+        if os.path.isfile(path):
+            newest = max(newest, os.path.getmtime(path))
+            continue
+
+        for directory, _, file_names in os.walk(path):
+            for file_name in file_names:
+                if not file_name.endswith('.pyc'):
+                    newest = max(newest, os.path.getmtime(os.path.join(directory, file_name)))
+
+    return newest
+
+
+def _output_path(policy, model_name):
+    directory = policy.split('.')[1]
+    return os.path.join('output_data', directory, '{}.json'.format(model_name))
+
+
+def policy_variants(policies, workers=1, force=False):
+    # The variants of the policies whose output is missing or older than the sources it was made from
+    sources_time = _newest_modification_time(SOURCE_DIRECTORIES + SHARED_POLICY_SOURCES)
+
+    with _fresh_process_pool(workers, len(policies)) as pool:
+        descriptions = list(pool.map(_describe_policy, policies))
+
+    variants = []
+    for policy, (module_file, runners) in zip(policies, descriptions):
+        if len(runners) == 0:
+            print("Skipping {}: it has no module level sweep or model".format(policy))
+            continue
+
+        policy_time = max(sources_time, os.path.getmtime(module_file))
+        for runner_index, (model_name, run_settings) in enumerate(runners):
+            output_path = _output_path(policy, model_name)
+            if not force and os.path.exists(output_path) and os.path.getmtime(output_path) >= policy_time:
+                print("Up to date: {}".format(output_path))
+                continue
+
+            variants.append(PolicyVariant(policy, runner_index, model_name, run_settings, output_path))
+
+    return variants
+
+
+def run_policies(policies, workers, force=False):
+    # Runs every (policy, variant, replicate) job on a pool of workers, each job in a fresh process, and writes
+    # the output of a variant as soon as its last replicate is done. A failed job is reported and the jobs of
+    # its variant that have not started are cancelled, so the other variants still finish; running again
+    # resumes with the variants that have no up to date output. Returns the failed variants.
+    variants = policy_variants(policies, workers, force)
+
+    jobs = {}
+    for variant_index, variant in enumerate(variants):
+        seed_sequences = run_seed_sequences(variant.run_settings.seed, variant.run_settings.number_of_runs)
+        for run_number, seed_sequence in enumerate(seed_sequences):
+            jobs[(variant_index, run_number)] = (variant.policy, variant.runner_index, run_number, seed_sequence)
+
+    print("{} jobs for {} variants".format(len(jobs), len(variants)))
+
+    finished = [{} for _ in variants]
+    failed = []
+    start = time.time()
+
+    with _fresh_process_pool(workers, len(jobs)) as pool:
+        futures = {pool.submit(_run_policy_job, *job): key for key, job in jobs.items()}
+
+        variant_futures = [[] for _ in variants]
+        for future, (variant_index, _) in futures.items():
+            variant_futures[variant_index].append(future)
+
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            variant_index, run_number = futures[future]
+            variant = variants[variant_index]
+            progress = "[{}/{} {:.0f}s] {} run {}".format(done, len(futures), time.time() - start,
+                                                         variant.model_name, run_number + 1)
+
+            if finished[variant_index] is None:
+                continue
+
+            try:
+                finished[variant_index][run_number] = future.result()
+            except Exception:
+                print("{} failed:\n{}".format(progress, traceback.format_exc()))
+                finished[variant_index] = None
+                failed.append(variant)
+
+                for other in variant_futures[variant_index]:
+                    other.cancel()
+                continue
+
+            print(progress)
+
+            if len(finished[variant_index]) == variant.run_settings.number_of_runs:
+                _write_variant(variant, finished[variant_index])
+
+    return failed
+
+
+def _write_variant(variant, results):
+    # A runner without rules or parameters, that only collects the results of the runs
+    runner = Runner(variant.run_settings, None, None, model_name=variant.model_name)
+    os.makedirs('output_data/one_run_data', exist_ok=True)
+    os.makedirs(os.path.dirname(variant.output_path), exist_ok=True)
+
+    for run_number in range(runner.run_settings.number_of_runs):
+        runner._add_run(*results[run_number])
+
+    with open(variant.output_path, 'w') as file:
+        json.dump(runner.runs, file)
+
+    print("Wrote {}".format(variant.output_path))
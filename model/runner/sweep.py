@@ -0,0 +1,58 @@
+import collections
+import json
+import os
+
+from model.model import Hooks
+from model.runner.runner import Parameters, Rules, Runner, run_jobs
+
+# A variant of a sweep: the name of its output file, and overrides of Rules and Parameters fields by name
+Variant = collections.namedtuple('Variant', ['model_name', 'overrides'])
+
+
+def with_overrides(rules, parameters, overrides):
+    unknown = [name for name in overrides if name not in Rules._fields and name not in Parameters._fields]
+    if len(unknown) > 0:
+        raise ValueError("Unknown rules or parameters: {}".format(", ".join(unknown)))
+
+    rules = rules._replace(**{name: value for name, value in overrides.items() if name in Rules._fields})
+    parameters = parameters._replace(**{name: value for name, value in overrides.items()
+                                        if name in Parameters._fields})
+
+    return rules, parameters
+
+
+class Sweep:
+    # Runs every replicate of every variant as a separate job, so a pool of workers is kept busy across variants.
+    # A variant's output file is written as soon as all of its replicates are done. All variants use the same
+    # seed sequences for their replicates.
+    def __init__(self, run_settings, parameters, rules, variants, data_collectors=None, collector_groups=None,
+                 individual_collectors=None, hooks=Hooks(), workers=1):
+        self.variants = variants
+        self.workers = workers
+
+        self.runners = []
+        for variant in variants:
+            variant_rules, variant_parameters = with_overrides(rules, parameters, variant.overrides)
+            self.runners.append(Runner(run_settings, variant_parameters, variant_rules,
+                                       data_collectors=data_collectors, collector_groups=collector_groups,
+                                       individual_collectors=individual_collectors, hooks=hooks,
+                                       model_name=variant.model_name))
+
+    def run(self, output_directory):
+        jobs = [job for runner_index, runner in enumerate(self.runners) for job in runner.jobs(runner_index)]
+
+        finished = [{} for _ in self.runners]
+        for runner_index, run_number, result in run_jobs(self.runners, jobs, self.workers):
+            runner = self.runners[runner_index]
+            finished[runner_index][run_number] = result
+
+            if len(finished[runner_index]) == runner.run_settings.number_of_runs:
+                for number in range(runner.run_settings.number_of_runs):
+                    runner._add_run(*finished[runner_index].pop(number))
+
+                self._write(runner, output_directory)
+
+    @staticmethod
+    def _write(runner, output_directory):
+        with open(os.path.join(output_directory, '{}.json'.format(runner.model_name)), 'w') as file:
+            json.dump(runner.runs, file)
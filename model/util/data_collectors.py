@@ -5,6 +5,7 @@ import numpy as np
 
 from extensions.house_sharing import ShareHouse
 from model.agents.house import SocialHouse, RentalHouse, BuyHouse
+from model.agents.household import current_utilities
 from model.util.contracts import Homeless, BuyingContract
 
 
@@ -16,28 +17,22 @@ def _mean_calc_helper(data):
 
 
 def _get_buy_transactions(model):
-    result = []
-    if model.year in model.buying_market.transaction_log:
-        for month in model.buying_market.transaction_log[model.year]:
-            result += model.buying_market.transaction_log[model.year][month]
-
-    return result
+    return model.buying_market.transaction_log.for_year(model.year)
 
 
 def _get_rental_transactions(model):
-    result = []
-    if model.year in model.rental_market.transaction_log:
-        for month in model.rental_market.transaction_log[model.year]:
-            result += model.rental_market.transaction_log[model.year][month]
+    return model.rental_market.transaction_log.for_year(model.year)
+
 
-    return result
+def _in_group(transactions, group_filter, model):
+    return np.array([group_filter(model.households[by]) for by in transactions.by.tolist()], dtype=bool)
 
 
 def mean_buy_transaction_value(group_filter, model):
     transactions = _get_buy_transactions(model)
-    filtered_transactions = [t for t in transactions if group_filter(model.households[t.by])]
+    in_group = _in_group(transactions, group_filter, model)
 
-    return _mean_calc_helper([t.value for t in filtered_transactions])
+    return _mean_calc_helper(transactions.value[in_group].tolist())
 
 
 mean_buy_transaction_value.__title__ = "Average transaction value"
@@ -47,9 +42,8 @@ mean_buy_transaction_value.__ylabel__ = "Price in euros"
 
 def count_buy_transactions(group_filter, model):
     transactions = _get_buy_transactions(model)
-    filtered_transactions = [t for t in transactions if group_filter(model.households[t.by])]
 
-    return len(filtered_transactions)
+    return int(np.count_nonzero(_in_group(transactions, group_filter, model)))
 
 
 count_buy_transactions.__title__ = "Number of buying transactions"
@@ -59,9 +53,9 @@ count_buy_transactions.__ylabel__ = "Number of transactions"
 
 def mean_rental_transaction_value(group_filter, model):
     transactions = _get_rental_transactions(model)
-    filtered_transactions = [t for t in transactions if group_filter(model.households[t.by])]
+    in_group = _in_group(transactions, group_filter, model)
 
-    return _mean_calc_helper([t.value for t in filtered_transactions])
+    return _mean_calc_helper(transactions.value[in_group].tolist())
 
 
 mean_rental_transaction_value.__title__ = "Average price of rental transactions"
@@ -71,9 +65,8 @@ mean_rental_transaction_value.__ylabel__ = "Price in euros"
 
 def count_rental_transactions(group_filter, model):
     transactions = _get_rental_transactions(model)
-    filtered_transactions = [t for t in transactions if group_filter(model.households[t.by])]
 
-    return len(filtered_transactions)
+    return int(np.count_nonzero(_in_group(transactions, group_filter, model)))
 
 
 count_rental_transactions.__title__ = "Number of rental transactions"
@@ -127,7 +120,12 @@ mean_m2_per_person.__ylabel__ = "$m^2$ per person"
 
 
 def mean_utility(group_filter, model):
-    return _mean_calc_helper([h.current_utility() for h in model.households.values() if group_filter(h)])
+    households = [h for h in model.households.values() if group_filter(h)]
+
+    if model.run_settings.batch_utility:
+        return _mean_calc_helper(list(current_utilities(households)))
+
+    return _mean_calc_helper([h.current_utility() for h in households])
 
 
 mean_utility.__title__ = "Average utility"
@@ -418,12 +416,12 @@ mean_want_to_move_time_wanting_to_move.__ylabel__ = "Months"
 
 def actual_wait_time(group_filter, model):
     buy_transactions = _get_buy_transactions(model)
-    filtered_buy_transactions = [t for t in buy_transactions if group_filter(model.households[t.by])]
     rental_transactions = _get_rental_transactions(model)
-    filtered_rental_transactions = [t for t in rental_transactions if group_filter(model.households[t.by])]
 
-    buy_wait_times = [t.wait_time for t in filtered_buy_transactions if t.wait_time >= 0]
-    rent_wait_times = [t.wait_time for t in filtered_rental_transactions if t.wait_time >= 0]
+    buy_wait_times = buy_transactions.wait_time[_in_group(buy_transactions, group_filter, model)
+                                                & (buy_transactions.wait_time >= 0)].tolist()
+    rent_wait_times = rental_transactions.wait_time[_in_group(rental_transactions, group_filter, model)
+                                                    & (rental_transactions.wait_time >= 0)].tolist()
     active_wait_times = [h.contract.want_to_move_time for h in model.households.values()
                          if group_filter(h) and h.contract.want_to_move]
 
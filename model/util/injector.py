@@ -1,11 +1,30 @@
+import functools
+import operator
+
+
 def inject(*to_inject):
+    # The attribute lookups are compiled once per decorated function and bound to the model by
+    # Injector.set_model, so a call costs one C-level call instead of a Python loop over the injectee
+    # names on Injector.model.
+    get_injectees = operator.attrgetter(*to_inject)
+
     def wrapper(fn):
-        def wrapper2(*args, **kwargs):
-            injectees = []
-            for injectee in to_inject:
-                injectees.append(getattr(Injector.model, injectee))
+        resolve = None
+
+        def bind(model):
+            nonlocal resolve
+            resolve = functools.partial(get_injectees, model)
+
+        Injector.add_binding(bind)
 
-            return fn(*args, *injectees, **kwargs)
+        if len(to_inject) == 1:
+            @functools.wraps(fn)
+            def wrapper2(*args, **kwargs):
+                return fn(*args, resolve(), **kwargs)
+        else:
+            @functools.wraps(fn)
+            def wrapper2(*args, **kwargs):
+                return fn(*args, *resolve(), **kwargs)
 
         return wrapper2
     return wrapper
@@ -13,8 +32,21 @@ def inject(*to_inject):
 
 class Injector:
     model = None
+    _bindings = []
 
     @classmethod
     def set_model(cls, model):
         cls.model = model
 
+        for bind in cls._bindings:
+            bind(model)
+
+    @classmethod
+    def get(cls, name, default=None):
+        # For code that also runs without a model, or with a model that lacks the injectee
+        return getattr(cls.model, name, default)
+
+    @classmethod
+    def add_binding(cls, bind):
+        cls._bindings.append(bind)
+        bind(cls.model)
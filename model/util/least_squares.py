@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class SlidingLeastSquares:
+    # Ordinary least squares with an intercept, kept as the sums X'X, X'y, sum(x) and sum(y) of the
+    # observations in its window. Observations are added and removed as the window slides, and solve()
+    # computes the coefficients from the sums, so nothing is refitted from the raw data.
+    def __init__(self, coef, intercept=0):
+        self.coef_ = np.array(coef, dtype=float)
+        self.intercept_ = intercept
+        self._reset()
+
+    def fit(self, X, y):
+        self._reset()
+        self.add(X, y)
+
+        return self.solve()
+
+    def add(self, X, y):
+        self._update(X, y, 1)
+
+    def remove(self, X, y):
+        self._update(X, y, -1)
+
+    def predict(self, X):
+        # Elementwise rather than a matrix product, so a row gets the same prediction in any batch.
+        return (np.asarray(X, dtype=float) * self.coef_).sum(axis=1) + self.intercept_
+
+    def _reset(self):
+        number_of_features = len(self.coef_)
+        self._n = 0
+        self._sum_x = np.zeros(number_of_features)
+        self._sum_y = 0.0
+        self._xtx = np.zeros((number_of_features, number_of_features))
+        self._xty = np.zeros(number_of_features)
+
+    def _update(self, X, y, sign):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(y) == 0:
+            return
+
+        self._n += sign * len(y)
+        self._sum_x += sign * X.sum(axis=0)
+        self._sum_y += sign * y.sum()
+        self._xtx += sign * (X.T @ X)
+        self._xty += sign * (X.T @ y)
+
+    def solve(self):
+        if self._n == 0:
+            return self
+
+        mean_x = self._sum_x / self._n
+        mean_y = self._sum_y / self._n
+
+        # Centred normal equations. lstsq gives the minimum norm solution when they are singular, as when all
+        # transactions in the window have the same size or quality.
+        centred_xtx = self._xtx - self._n * np.outer(mean_x, mean_x)
+        centred_xty = self._xty - self._n * mean_x * mean_y
+
+        self.coef_ = np.linalg.lstsq(centred_xtx, centred_xty, rcond=1e-10)[0]
+        self.intercept_ = mean_y - mean_x @ self.coef_
+
+        return self
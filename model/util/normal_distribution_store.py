@@ -1,22 +1,11 @@
-from model.util.rng import rng
+from model.util.random_streams import NormalStream, register_stream
 
 
-class NormalDistributionStore:
+class NormalDistributionStore(NormalStream):
+    # The random utility term. Filled when it is created, unlike the other streams.
     def __init__(self, mean, sigma, num_values=100_000):
-        self.mean = mean
-        self.sigma = sigma
+        super().__init__('rum', 'utility', mean, sigma, num_values)
         self.num_values = num_values
 
-        self.index = 0
-        self.values = rng.normal(mean, sigma, num_values)
-
-    def next(self):
-        if self.index >= len(self.values):
-            self.index = 0
-            # print("renew")
-            self.values = rng.normal(self.mean, self.sigma, self.num_values)
-
-        value = self.values[self.index]
-        self.index += 1
-
-        return value
+        register_stream(self)
+        self._refill()
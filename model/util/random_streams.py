@@ -0,0 +1,192 @@
+import collections
+import time
+
+import numpy as np
+from scipy.stats import skewnorm
+
+from model.util.rng import generator
+
+DEFAULT_BUFFER_SIZE = 100_000
+
+StreamStats = collections.namedtuple('StreamStats', ['draws', 'refills', 'refill_seconds'])
+
+
+class RandomStream:
+    # Values drawn in bulk from the generator of a subsystem in model/util/rng.py and handed out one at a time
+    # or in batches. Every stream counts its draws and the time spent refilling its buffer.
+    def __init__(self, name, subsystem, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.name = name
+        self.subsystem = subsystem
+        self.buffer_size = buffer_size
+
+        self.values = np.empty(0)
+        self.index = 0
+
+        self.draws = 0
+        self.refills = 0
+        self.refill_seconds = 0.0
+
+    def next(self):
+        if self.index >= len(self.values):
+            self._refill()
+
+        value = self.values[self.index]
+        self.index += 1
+        self.draws += 1
+
+        return value
+
+    def next_batch(self, number_of_values):
+        # Same values, in the same order, as calling next() number_of_values times
+        self.draws += number_of_values
+
+        batch = []
+        while number_of_values > 0:
+            if self.index >= len(self.values):
+                self._refill()
+
+            values = self.values[self.index:self.index + number_of_values]
+            self.index += len(values)
+            number_of_values -= len(values)
+            batch.append(values)
+
+        if len(batch) == 0:
+            return np.empty(0)
+        if len(batch) == 1:
+            return batch[0]
+
+        return np.concatenate(batch)
+
+    def reset(self):
+        self.values = np.empty(0)
+        self.index = 0
+
+    def stats(self):
+        return StreamStats(self.draws, self.refills, self.refill_seconds)
+
+    def _refill(self):
+        start = time.perf_counter()
+        self.values = self._draw(generator(self.subsystem), self.buffer_size)
+        self.index = 0
+        self.refills += 1
+        self.refill_seconds += time.perf_counter() - start
+
+    def _draw(self, generator, size):
+        raise NotImplementedError
+
+
+class UniformStream(RandomStream):
+    def _draw(self, generator, size):
+        return generator.random(size)
+
+
+class IntegerStream(RandomStream):
+    # Integers with low <= value < high
+    def __init__(self, name, subsystem, low, high, buffer_size=DEFAULT_BUFFER_SIZE):
+        super().__init__(name, subsystem, buffer_size)
+        self.low = low
+        self.high = high
+
+    def _draw(self, generator, size):
+        return generator.integers(self.low, self.high, size=size)
+
+
+class NormalStream(RandomStream):
+    def __init__(self, name, subsystem, mean, sigma, buffer_size=DEFAULT_BUFFER_SIZE):
+        super().__init__(name, subsystem, buffer_size)
+        self.mean = mean
+        self.sigma = sigma
+
+    def _draw(self, generator, size):
+        return generator.normal(self.mean, self.sigma, size)
+
+
+class SkewNormalStream(RandomStream):
+    def __init__(self, name, subsystem, skew, loc, scale, buffer_size=DEFAULT_BUFFER_SIZE):
+        super().__init__(name, subsystem, buffer_size)
+        self.skew = skew
+        self.loc = loc
+        self.scale = scale
+
+    def _draw(self, generator, size):
+        return skewnorm.rvs(self.skew, loc=self.loc, scale=self.scale, size=size, random_state=generator)
+
+
+class PermutationStream(UniformStream):
+    # Orders and samples drawn from buffered uniform keys, one key per position.
+    def permutation(self, number_of_items):
+        return np.argsort(self.next_batch(number_of_items), kind='stable')
+
+    def shuffle(self, items):
+        items[:] = [items[index] for index in self.permutation(len(items)).tolist()]
+
+    def sample(self, population_size, number_of_samples):
+        # Partial Fisher-Yates over range(population_size), with the swapped positions kept in a dict, so a
+        # sample costs number_of_samples keys however large the population is.
+        keys = self.next_batch(number_of_samples).tolist()
+
+        swapped = {}
+        result = []
+        for i, key in enumerate(keys):
+            j = i + min(int(key * (population_size - i)), population_size - i - 1)
+            result.append(swapped.get(j, j))
+            swapped[j] = swapped.get(i, i)
+
+        return result
+
+
+_streams = {}
+
+
+def _stream(stream_type, name, subsystem, *args):
+    if name not in _streams:
+        _streams[name] = stream_type(name, subsystem, *args)
+
+    stream = _streams[name]
+    if type(stream) is not stream_type:
+        raise ValueError("Random stream {} is a {}, not a {}".format(name, type(stream).__name__,
+                                                                    stream_type.__name__))
+
+    return stream
+
+
+def register_stream(stream):
+    # For streams made outside this module, such as the RUM store of each utility function. They are
+    # registered under their name with a number added if the name is taken.
+    name = stream.name
+    number = 1
+    while name in _streams:
+        number += 1
+        name = "{}-{}".format(stream.name, number)
+
+    _streams[name] = stream
+
+
+def uniform_stream(name, subsystem):
+    return _stream(UniformStream, name, subsystem)
+
+
+def integer_stream(name, subsystem, low, high):
+    return _stream(IntegerStream, name, subsystem, low, high)
+
+
+def normal_stream(name, subsystem, mean, sigma):
+    return _stream(NormalStream, name, subsystem, mean, sigma)
+
+
+def skew_normal_stream(name, subsystem, skew, loc, scale):
+    return _stream(SkewNormalStream, name, subsystem, skew, loc, scale)
+
+
+def permutation_stream(name, subsystem):
+    return _stream(PermutationStream, name, subsystem)
+
+
+def stream_stats():
+    return {name: stream.stats() for name, stream in _streams.items()}
+
+
+def reset_streams():
+    # Drops the buffered values, so the next draws come from the generators as they are now, e.g. after seeding
+    for stream in _streams.values():
+        stream.reset()
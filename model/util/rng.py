@@ -1,4 +1,23 @@
 import numpy as np
 
-rng = np.random.default_rng()
+# Every subsystem draws from its own generator. Seeding spawns one child of the run's SeedSequence per
+# subsystem, in this order, so the subsystems get independent streams and adding a draw to one of them does
+# not shift the others. New subsystems go at the end to keep the streams of the existing ones.
+SUBSYSTEMS = ('households', 'markets', 'factories', 'construction', 'utility', 'extensions')
 
+_generators = {subsystem: np.random.default_rng() for subsystem in SUBSYSTEMS}
+
+
+def generator(subsystem):
+    return _generators[subsystem]
+
+
+def seed_generators(seed_sequence):
+    for subsystem, child in zip(SUBSYSTEMS, seed_sequence.spawn(len(SUBSYSTEMS))):
+        _generators[subsystem] = np.random.default_rng(child)
+
+
+def run_seed_sequences(seed, number_of_runs):
+    # One independent SeedSequence per run. Without a master seed they are spawned from fresh entropy, so runs
+    # in forked worker processes do not share the generator state of their parent.
+    return np.random.SeedSequence(seed).spawn(number_of_runs)
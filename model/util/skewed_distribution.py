@@ -1,7 +1,7 @@
 from scipy.stats import skewnorm
 
 
-def skewed_distribution(mean, median, size=1, sigma=None):
+def skewed_distribution(mean, median, size=1, sigma=None, random_state=None):
     # Note: When sigma is None, sigma will always equal (mean - median) for now,
     #  so skew is always -3 or + 3
     if sigma is None:
@@ -11,7 +11,7 @@ def skewed_distribution(mean, median, size=1, sigma=None):
     if not sigma == 0:
         skew = 3 * (mean - median) / sigma
 
-    r = skewnorm.rvs(skew, loc=mean, size=size, scale=sigma)
+    r = skewnorm.rvs(skew, loc=mean, size=size, scale=sigma, random_state=random_state)
     if size == 1:
         return r[0]
 
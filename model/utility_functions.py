@@ -1,4 +1,10 @@
-from model.constants import MONTHS
+import math
+
+import numpy as np
+
+from model.agents.house import house_arrays
+from model.agents.household import left_over_money_batch, household_arrays, is_stock
+from model.constants import MONTHS, MIN_BATCH_SIZE
 from model.util.contracts import NoHouse
 from model.util.normal_distribution_store import NormalDistributionStore
 
@@ -16,6 +22,26 @@ class Utility:
     def __call__(self, household, house, cost):
         pass
 
+    def scores_in_batches(self, number_of_utilities):
+        # Whether batch() scores this many utilities in one go, so their random terms can be drawn up front and
+        # passed in as rums. Otherwise __call__ draws the term of every utility itself.
+        return False
+
+    def batch(self, households, houses, costs, rums=None):
+        if rums is not None:
+            raise ValueError("Utilities scored one at a time draw their own random terms")
+
+        return np.array([self(household, house, cost) for household, house, cost in zip(households, houses, costs)])
+
+    def score(self, households, houses, costs, moving):
+        # For utilities without a vectorized score: calls __call__ for every element, in row order, with the
+        # household and house objects carried by the HouseholdArrays and HouseArrays
+        households, houses, costs = np.broadcast_arrays(households.household, houses.house, costs)
+        utilities = [self(household, house, cost) for household, house, cost
+                     in zip(households.ravel().tolist(), houses.ravel().tolist(), costs.ravel().tolist())]
+
+        return np.array(utilities, dtype=float).reshape(costs.shape)
+
 
 # class LinearUtility(Utility):
 #     def __call__(self, household, house, cost):
@@ -74,12 +100,58 @@ class MultiplyQualityRootSizeUtility(Utility):
         homeless_penalty = 5 if isinstance(household.contract.house, NoHouse) else 0
 
         return self.money_weight * household.left_over_money(cost, house) \
-               + self.house_size_weight * (house.size / household.size) ** 0.5 \
+               + self.house_size_weight * math.sqrt(house.size / household.size) \
                * self.house_quality_weight * house.quality \
                - movement_cost \
                - homeless_penalty\
                + rum
 
+    def scores_in_batches(self, number_of_utilities):
+        # The vectorized score repeats __call__ and Household.left_over_money, so if a policy replaced either
+        # of them the utilities are computed one at a time, as are batches too small to pay for the arrays
+        return number_of_utilities >= MIN_BATCH_SIZE and type(self).__call__ is STOCK_CALL \
+            and is_stock('left_over_money')
+
+    def batch(self, households, houses, costs, rums=None):
+        if not self.scores_in_batches(len(households)):
+            return super().batch(households, houses, costs, rums)
+
+        moving = np.array([not house == household.contract.house for household, house in zip(households, houses)],
+                          dtype=bool)
+
+        return self.score(household_arrays(households), house_arrays(houses), np.asarray(costs, dtype=float), moving,
+                          rums)
+
+    def score(self, households, houses, costs, moving, rums=None):
+        # Arguments are HouseholdArrays and HouseArrays that broadcast against costs, so a
+        # (households x 1) column can be scored against a (households x listings) matrix.
+        if type(self).__call__ is not STOCK_CALL or not is_stock('left_over_money'):
+            return super().score(households, houses, costs, moving)
+
+        if rums is None:
+            rums = self.normal_distribution_store.next_batch(costs.size).reshape(costs.shape)
+
+        movement_costs = np.where(households.run_time > 0,
+                                  self.movement_cost * (len(MONTHS) / np.where(households.run_time > 0,
+                                                                               households.run_time, 1)),
+                                  self.movement_cost)
+        movement_costs = np.where(moving & ~households.homeless, movement_costs, 0)
+
+        homeless_penalties = np.where(households.homeless, 5, 0)
+
+        left_over_money = left_over_money_batch(households.income, households.wealth, households.size,
+                                                households.age, costs, houses.for_sale)
+
+        return self.money_weight * left_over_money \
+               + self.house_size_weight * np.sqrt(houses.size / households.size) \
+               * self.house_quality_weight * houses.quality \
+               - movement_costs \
+               - homeless_penalties \
+               + rums
+
+
+STOCK_CALL = MultiplyQualityRootSizeUtility.__call__
+
 
 # class MultiplyQualityRootSizeUtilityAlternativeMovementCost(Utility):
 #     def __call__(self, household, house, cost):
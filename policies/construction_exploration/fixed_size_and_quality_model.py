@@ -1,6 +1,8 @@
 import json
 import os
 
+import numpy as np
+
 from model.model import Hooks
 from model.runner.runner import RunSettings, Parameters, Runner, Rules
 from model.utility_functions import default_utility_function
@@ -17,12 +19,12 @@ SIZE = 120
 QUALITY = 5
 
 
-def size_distribution():
-    return SIZE
+def size_distribution(count):
+    return np.full(count, SIZE)
 
 
-def quality_distribution():
-    return QUALITY
+def quality_distribution(count):
+    return np.full(count, QUALITY)
 
 
 def set_houses_size_and_quality(model):
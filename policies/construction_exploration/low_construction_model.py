@@ -5,6 +5,7 @@ import numpy as np
 
 from model.constants import MIN_HOUSE_SIZE, MAX_HOUSE_SIZE, MIN_HOUSE_QUALITY, MAX_HOUSE_QUALITY
 from model.runner.runner import RunSettings, Parameters, Runner, Rules
+from model.util.rng import generator
 from model.utility_functions import default_utility_function
 from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors
 
@@ -16,12 +17,12 @@ parameters = Parameters(default_utility_function, buy_market_price_params=[250,
                         rent_market_price_params=[4, 8, 150])
 
 
-def size_distribution():
-    return min(max(np.random.normal(70, 30), MIN_HOUSE_SIZE), MAX_HOUSE_SIZE)
+def size_distribution(count):
+    return np.clip(generator('construction').normal(70, 30, size=count), MIN_HOUSE_SIZE, MAX_HOUSE_SIZE)
 
 
-def quality_distribution():
-    return min(max(np.random.normal(3, 2), MIN_HOUSE_QUALITY), MAX_HOUSE_QUALITY)
+def quality_distribution(count):
+    return np.clip(generator('construction').normal(3, 2, size=count), MIN_HOUSE_QUALITY, MAX_HOUSE_QUALITY)
 
 
 rules = Rules(construction={"percentage_for_rent": 0.45,
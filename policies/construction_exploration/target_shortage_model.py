@@ -1,9 +1,10 @@
-import json
 import os
 
-from model.runner.runner import RunSettings, Parameters, Runner, Rules
+from model.runner.runner import RunSettings, Parameters, Rules
+from model.runner.sweep import Sweep, Variant
 from model.utility_functions import default_utility_function
-from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors
+from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors, \
+    WORKERS
 
 run_settings = RunSettings(start_year=START_YEAR, end_year=END_YEAR, scale_factor=SCALE_FACTOR,
                            calibration_length=CALIBRATION_LENGTH, number_of_runs=NUMBER_OF_RUNS)
@@ -17,19 +18,16 @@ target_shortages = [-0.1, -0.02, 0.1]
 file_name = os.path.basename(__file__)
 first_part_model_name, _ = os.path.splitext(file_name)
 
-if __name__ == '__main__':
-    for target_shortage in target_shortages:
-        rules = Rules(construction={"percentage_for_rent": 0.45,
-                                    "target_shortage": target_shortage,
-                                    "max_build_limit": 150_000})
-
-        model = Runner(run_settings, parameters, rules, data_collectors=data_collectors)
-        model.run()
+variants = [Variant("{}-target={}".format(first_part_model_name, target_shortage),
+                    {'construction': {"percentage_for_rent": 0.45,
+                                     "target_shortage": target_shortage,
+                                     "max_build_limit": 150_000}})
+            for target_shortage in target_shortages]
 
-        model_name = "{}-target={}".format(first_part_model_name, target_shortage)
+sweep = Sweep(run_settings, parameters, Rules(), variants, data_collectors=data_collectors, workers=WORKERS)
 
-        with open('output_data/construction_exploration/{}.json'.format(model_name), 'w') as file:
-            json.dump(model.runs, file)
+if __name__ == '__main__':
+    sweep.run('output_data/construction_exploration')
 
 # Store output_data in file!!
 # for each data collector store output_data in file
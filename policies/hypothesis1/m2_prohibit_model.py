@@ -1,4 +1,3 @@
-import json
 import os
 
 from extensions.fixed_construction import construct_fixed_total
@@ -6,10 +5,11 @@ from extensions.prohibit_too_high_m2_per_person import get_best_option_from_mark
     get_best_social_rent_option_with_m2_prohibition, get_best_non_social_rent_option_with_m2_prohibition
 from model.agents.market import BuyingMarket, SocialMarket
 from model.containers.houses import Houses
-from model.runner.runner import RunSettings, Parameters, Runner, Rules
+from model.runner.runner import RunSettings, Parameters, Rules
+from model.runner.sweep import Sweep, Variant
 from model.utility_functions import default_utility_function
 from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors, \
-    collector_groups
+    collector_groups, WORKERS
 
 run_settings = RunSettings(start_year=START_YEAR, end_year=END_YEAR, scale_factor=SCALE_FACTOR,
                            calibration_length=CALIBRATION_LENGTH, number_of_runs=NUMBER_OF_RUNS)
@@ -28,16 +28,14 @@ m2_limits = [30, 55, 80, 105]
 file_name = os.path.basename(__file__)
 first_part_model_name, _ = os.path.splitext(file_name)
 
-if __name__ == '__main__':
-    for m2_limit in m2_limits:
-        model = Runner(run_settings, parameters, Rules(m2_per_person_limit=m2_limit),
-                       data_collectors=data_collectors, collector_groups=collector_groups)
+variants = [Variant("{}-m2_limit={}".format(first_part_model_name, m2_limit), {'m2_per_person_limit': m2_limit})
+            for m2_limit in m2_limits]
 
-        model.run()
-        model_name = "{}-m2_limit={}".format(first_part_model_name, m2_limit)
+sweep = Sweep(run_settings, parameters, Rules(), variants, data_collectors=data_collectors,
+              collector_groups=collector_groups, workers=WORKERS)
 
-        with open('output_data/hypothesis1/{}.json'.format(model_name), 'w') as file:
-            json.dump(model.runs, file)
+if __name__ == '__main__':
+    sweep.run('output_data/hypothesis1')
 
 # Store output_data in file!!
 # for each data collector store output_data in file
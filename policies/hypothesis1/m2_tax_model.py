@@ -1,4 +1,3 @@
-import json
 import os
 
 from extensions.fixed_construction import construct_fixed_total
@@ -6,10 +5,11 @@ from extensions.tax_m2_per_person import left_over_money_with_m2_per_person_tax,
 from model.agents.household import Household
 from model.containers.houses import Houses
 from model.model import Hooks
-from model.runner.runner import RunSettings, Parameters, Runner, Rules
+from model.runner.runner import RunSettings, Parameters, Rules
+from model.runner.sweep import Sweep, Variant
 from model.utility_functions import default_utility_function
 from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors, \
-    collector_groups
+    collector_groups, WORKERS
 
 run_settings = RunSettings(start_year=START_YEAR, end_year=END_YEAR, scale_factor=SCALE_FACTOR,
                            calibration_length=CALIBRATION_LENGTH, number_of_runs=NUMBER_OF_RUNS)
@@ -62,7 +62,7 @@ first_part_model_name, _ = os.path.splitext(file_name)
 
 
 def setup_government(m):
-    m.government = M2TaxGovernment()
+    m.government = M2TaxGovernment(liberalisation_threshold=m.rules.liberalisation_threshold)
 
 
 hooks = Hooks(
@@ -70,16 +70,15 @@ hooks = Hooks(
     end_of_year=[]
 )
 
-if __name__ == '__main__':
-    for policy in taxation_policies:
-        model = Runner(run_settings, parameters, Rules(m2_tax=policy),
-                       data_collectors=data_collectors, collector_groups=collector_groups, hooks=hooks)
+variants = [Variant("{}-policy={}".format(first_part_model_name, policy.__name__),
+                    {'m2_tax': policy})
+            for policy in taxation_policies]
 
-        model.run()
-        model_name = "{}-policy={}".format(first_part_model_name, policy.__name__)
+sweep = Sweep(run_settings, parameters, Rules(), variants, data_collectors=data_collectors,
+              collector_groups=collector_groups, hooks=hooks, workers=WORKERS)
 
-        with open('output_data/hypothesis1/{}.json'.format(model_name), 'w') as file:
-            json.dump(model.runs, file)
+if __name__ == '__main__':
+    sweep.run('output_data/hypothesis1')
 
 # Store output_data in file!!
 # for each data collector store output_data in file
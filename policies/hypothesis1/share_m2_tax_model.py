@@ -40,7 +40,7 @@ M2TaxGovernment.set_new_tax_rate = set_new_tax_rate_sharing
 
 
 def setup_government(m):
-    m.government = M2TaxGovernment()
+    m.government = M2TaxGovernment(liberalisation_threshold=m.rules.liberalisation_threshold)
 
 
 hooks = Hooks(
@@ -1,4 +1,3 @@
-import json
 import os
 
 from extensions.fixed_construction import construct_fixed_total
@@ -6,10 +5,11 @@ from extensions.split_unused_houses import split_houses_hook, set_new_tax_rate_s
 from model.agents.government import Government
 from model.containers.houses import Houses
 from model.model import Hooks
-from model.runner.runner import RunSettings, Parameters, Runner, Rules
+from model.runner.runner import RunSettings, Parameters, Rules
+from model.runner.sweep import Sweep, Variant
 from model.utility_functions import default_utility_function
 from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors, \
-    collector_groups
+    collector_groups, WORKERS
 
 run_settings = RunSettings(start_year=START_YEAR, end_year=END_YEAR, scale_factor=SCALE_FACTOR,
                            calibration_length=CALIBRATION_LENGTH, number_of_runs=NUMBER_OF_RUNS)
@@ -30,16 +30,15 @@ hooks = Hooks(
     end_of_year=[split_houses_hook]
 )
 
-if __name__ == '__main__':
-    for m2_limit in m2_limits:
-        model = Runner(run_settings, parameters, Rules(m2_per_person_limit=m2_limit),
-                       data_collectors=data_collectors, collector_groups=collector_groups, hooks=hooks)
+variants = [Variant("{}-split_limit={}".format(first_part_model_name, m2_limit),
+                    {'m2_per_person_limit': m2_limit})
+            for m2_limit in m2_limits]
 
-        model.run()
-        model_name = "{}-split_limit={}".format(first_part_model_name, m2_limit)
+sweep = Sweep(run_settings, parameters, Rules(), variants, data_collectors=data_collectors,
+              collector_groups=collector_groups, hooks=hooks, workers=WORKERS)
 
-        with open('output_data/hypothesis1/{}.json'.format(model_name), 'w') as file:
-            json.dump(model.runs, file)
+if __name__ == '__main__':
+    sweep.run('output_data/hypothesis1')
 
 # Store output_data in file!!
 # for each data collector store output_data in file
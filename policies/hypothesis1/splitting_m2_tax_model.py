@@ -58,7 +58,7 @@ def add_split_count_to_houses(m):
 
 
 def setup_government(m):
-    m.government = M2TaxGovernment()
+    m.government = M2TaxGovernment(liberalisation_threshold=m.rules.liberalisation_threshold)
 
 
 hooks = Hooks(
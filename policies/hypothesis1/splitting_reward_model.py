@@ -1,4 +1,3 @@
-import json
 import os
 
 from extensions.fixed_construction import construct_fixed_total
@@ -8,10 +7,11 @@ from model.agents.government import Government
 from model.agents.household import Household
 from model.containers.houses import Houses
 from model.model import Hooks
-from model.runner.runner import RunSettings, Parameters, Runner, Rules
+from model.runner.runner import RunSettings, Parameters, Rules
+from model.runner.sweep import Sweep, Variant
 from model.utility_functions import default_utility_function
 from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors, \
-    collector_groups
+    collector_groups, WORKERS
 
 run_settings = RunSettings(start_year=START_YEAR, end_year=END_YEAR, scale_factor=SCALE_FACTOR,
                            calibration_length=CALIBRATION_LENGTH, number_of_runs=NUMBER_OF_RUNS)
@@ -39,16 +39,14 @@ rewards = [5_000, 10_000, 20_000, 30_000]
 file_name = os.path.basename(__file__)
 first_part_model_name, _ = os.path.splitext(file_name)
 
-if __name__ == '__main__':
-    for reward in rewards:
-        model = Runner(run_settings, parameters, Rules(split_bonus=reward), data_collectors=data_collectors,
-                       collector_groups=collector_groups, hooks=hooks)
+variants = [Variant("{}-reward={}".format(first_part_model_name, reward), {'split_bonus': reward})
+            for reward in rewards]
 
-        model.run()
-        model_name = "{}-reward={}".format(first_part_model_name, reward)
+sweep = Sweep(run_settings, parameters, Rules(), variants, data_collectors=data_collectors,
+              collector_groups=collector_groups, hooks=hooks, workers=WORKERS)
 
-        with open('output_data/hypothesis1/{}.json'.format(model_name), 'w') as file:
-            json.dump(model.runs, file)
+if __name__ == '__main__':
+    sweep.run('output_data/hypothesis1')
 
 # Store output_data in file!!
 # for each data collector store output_data in file
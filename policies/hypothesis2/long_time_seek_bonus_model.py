@@ -21,7 +21,7 @@ def deserve_bonus(household):
 
 def make_bank_bonus_bank(m):
     m.bank = BonusBank()
-    m.government = BonusGovernment()
+    m.government = BonusGovernment(liberalisation_threshold=m.rules.liberalisation_threshold)
 
 
 hooks = Hooks(
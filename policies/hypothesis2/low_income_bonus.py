@@ -1,11 +1,12 @@
-import json
 import os
 
 from extensions.buyer_bonus import BonusBank, BonusGovernment
 from model.model import Hooks
-from model.runner.runner import RunSettings, Parameters, Runner, Rules
+from model.runner.runner import RunSettings, Parameters, Rules
+from model.runner.sweep import Sweep, Variant
 from model.utility_functions import default_utility_function
-from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors
+from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors, \
+    WORKERS
 
 run_settings = RunSettings(start_year=START_YEAR, end_year=END_YEAR, scale_factor=SCALE_FACTOR,
                            calibration_length=CALIBRATION_LENGTH, number_of_runs=NUMBER_OF_RUNS)
@@ -21,7 +22,7 @@ def deserve_bonus(household):
 
 def make_bank_bonus_bank(m):
     m.bank = BonusBank()
-    m.government = BonusGovernment()
+    m.government = BonusGovernment(liberalisation_threshold=m.rules.liberalisation_threshold)
 
 
 hooks = Hooks(
@@ -36,16 +37,15 @@ file_name = os.path.basename(__file__)
 first_part_model_name, _ = os.path.splitext(file_name)
 
 
-if __name__ == '__main__':
-    for bonus in boni:
-        rules = Rules(buy_bonus={"value": bonus, "deserve?": deserve_bonus})
-        model = Runner(run_settings, parameters, rules, data_collectors=data_collectors, hooks=hooks)
+variants = [Variant("{}-bonus={}".format(first_part_model_name, bonus),
+                    {'buy_bonus': {"value": bonus, "deserve?": deserve_bonus}})
+            for bonus in boni]
 
-        model.run()
-        model_name = "{}-bonus={}".format(first_part_model_name, bonus)
+sweep = Sweep(run_settings, parameters, Rules(), variants, data_collectors=data_collectors, hooks=hooks,
+              workers=WORKERS)
 
-        with open('output_data/hypothesis2/{}.json'.format(model_name), 'w') as file:
-            json.dump(model.runs, file)
+if __name__ == '__main__':
+    sweep.run('output_data/hypothesis2')
 
 # Store output_data in file!!
 # for each data collector store output_data in file
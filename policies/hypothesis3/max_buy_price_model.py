@@ -1,9 +1,10 @@
-import json
 import os
 
-from model.runner.runner import RunSettings, Parameters, Runner, Rules
+from model.runner.runner import RunSettings, Parameters, Rules
+from model.runner.sweep import Sweep, Variant
 from model.utility_functions import default_utility_function
-from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors
+from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors, \
+    WORKERS
 
 run_settings = RunSettings(start_year=START_YEAR, end_year=END_YEAR, scale_factor=SCALE_FACTOR,
                            calibration_length=CALIBRATION_LENGTH, number_of_runs=NUMBER_OF_RUNS)
@@ -18,17 +19,14 @@ prices = [140_000, 180_000, 220_000]
 file_name = os.path.basename(__file__)
 first_part_model_name, _ = os.path.splitext(file_name)
 
-if __name__ == '__main__':
-    for price in prices:
-        rules = Rules(max_buy_price=price)
-        model = Runner(run_settings, parameters, rules, data_collectors=data_collectors)
-
-        model.run()
+variants = [Variant("{}-price={}".format(first_part_model_name, price),
+                    {'max_buy_price': price})
+            for price in prices]
 
-        model_name = "{}-price={}".format(first_part_model_name, price)
+sweep = Sweep(run_settings, parameters, Rules(), variants, data_collectors=data_collectors, workers=WORKERS)
 
-        with open('output_data/hypothesis3/{}.json'.format(model_name), 'w') as file:
-            json.dump(model.runs, file)
+if __name__ == '__main__':
+    sweep.run('output_data/hypothesis3')
 
 # Store output_data in file!!
 # for each data collector store output_data in file
@@ -1,9 +1,10 @@
-import json
 import os
 
-from model.runner.runner import RunSettings, Parameters, Runner, Rules
+from model.runner.runner import RunSettings, Parameters, Rules
+from model.runner.sweep import Sweep, Variant
 from model.utility_functions import default_utility_function
-from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors
+from policies.run_settings import START_YEAR, END_YEAR, SCALE_FACTOR, CALIBRATION_LENGTH, NUMBER_OF_RUNS, data_collectors, \
+    WORKERS
 
 run_settings = RunSettings(start_year=START_YEAR, end_year=END_YEAR, scale_factor=SCALE_FACTOR,
                            calibration_length=CALIBRATION_LENGTH, number_of_runs=NUMBER_OF_RUNS)
@@ -12,22 +13,20 @@ run_settings = RunSettings(start_year=START_YEAR, end_year=END_YEAR, scale_facto
 parameters = Parameters(default_utility_function, buy_market_price_params=[250, 1500, 180000],
                         rent_market_price_params=[4, 8, 150])
 
-income_limit_rules = [
-    Rules(max_income_one_person_household=20_000, max_income_multi_person_household=22_500),
-    Rules(max_income_one_person_household=60_000, max_income_multi_person_household=67_500)]
+income_limits = [
+    {'max_income_one_person_household': 20_000, 'max_income_multi_person_household': 22_500},
+    {'max_income_one_person_household': 60_000, 'max_income_multi_person_household': 67_500}]
 
 file_name = os.path.basename(__file__)
 first_part_model_name, _ = os.path.splitext(file_name)
 
-if __name__ == '__main__':
-    for rules in income_limit_rules:
-        model = Runner(run_settings, parameters, rules, data_collectors=data_collectors)
-        model.run()
+variants = [Variant("{}-max_income={}".format(first_part_model_name, limits['max_income_one_person_household']), limits)
+            for limits in income_limits]
 
-        model_name = "{}-max_income={}".format(first_part_model_name, rules.max_income_one_person_household)
+sweep = Sweep(run_settings, parameters, Rules(), variants, data_collectors=data_collectors, workers=WORKERS)
 
-        with open('output_data/misc/{}.json'.format(model_name), 'w') as file:
-            json.dump(model.runs, file)
+if __name__ == '__main__':
+    sweep.run('output_data/misc')
 
 # Store output_data in file!!
 # for each data collector store output_data in file
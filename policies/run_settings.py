@@ -6,6 +6,9 @@ END_YEAR = 2061
 CALIBRATION_LENGTH = 100
 SCALE_FACTOR = 12_500
 NUMBER_OF_RUNS = 50
+# Runs are serial unless asked for more processes, here or with main.py --workers. A pool never has more
+# workers than it has runs.
+WORKERS = 1
 
 collector_groups = [
     ('all', lambda h: True),
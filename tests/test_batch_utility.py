@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from extensions.tax_m2_per_person import left_over_money_with_m2_per_person_tax
+from model import utility_functions
+from model.agents import market
+from model.agents.agent import Agent
+from model.agents.household import Household, left_over_money_batch
+from model.factories.house_factory import HouseFactory
+from model.factories.household_factory import HouseholdFactory
+from model.model import Model
+from model.runner.runner import RunSettings, Parameters, Rules
+from model.util.rng import generator
+from model.utility_functions import default_utility_function
+from policies.run_settings import data_collectors, collector_groups
+
+PARAMETERS = Parameters(default_utility_function, buy_market_price_params=[250, 1500, 180000],
+                        rent_market_price_params=[4, 8, 150])
+
+
+@pytest.fixture
+def model(monkeypatch):
+    # Brochures of 10 listings are below MIN_BATCH_SIZE, so batches of every size are scored here
+    monkeypatch.setattr(utility_functions, 'MIN_BATCH_SIZE', 1)
+
+    Agent.reset_id_iter()
+    run_settings = RunSettings(start_year=2012, end_year=2013, scale_factor=40_000, calibration_length=1,
+                               number_of_runs=1, batch_utility=True, seed=1)
+
+    model = Model(run_settings, PARAMETERS, Rules(m2_tax=lambda m2_per_person: 2 * m2_per_person),
+                  HouseholdFactory(), HouseFactory())
+    model._initialize()
+    model._tick(calibrate=True)
+
+    return model
+
+
+def _utilities(model, score):
+    # Scores a rental brochure for a number of households, and rewinds the RUM draws afterwards, so every
+    # call sees the same draws
+    store = model.parameters.utility.normal_distribution_store
+    state = generator(store.subsystem).bit_generator.state
+    values, index = store.values, store.index
+
+    listings = list(model.rental_market.listings.values())[:10]
+    houses = [listing.house for listing in listings]
+    costs = [listing.value for listing in listings]
+
+    utilities = [score(household, houses, costs) for household in list(model.households.values())[:20]]
+
+    generator(store.subsystem).bit_generator.state = state
+    store.values, store.index = values, index
+
+    return np.array(utilities)
+
+
+def _batch(household, houses, costs):
+    return household.utilities(houses, costs)
+
+
+def _scalar(household, houses, costs):
+    return [household.utility(house, cost) for house, cost in zip(houses, costs)]
+
+
+def test_batch_equals_scalar(model):
+    np.testing.assert_array_equal(_utilities(model, _batch), _utilities(model, _scalar))
+
+
+def test_batch_equals_scalar_with_patched_left_over_money(model, monkeypatch):
+    stock = _utilities(model, _batch)
+
+    monkeypatch.setattr(Household, 'left_over_money', left_over_money_with_m2_per_person_tax)
+    patched = _utilities(model, _batch)
+
+    np.testing.assert_array_equal(patched, _utilities(model, _scalar))
+    assert not np.array_equal(patched, stock)
+
+
+def test_left_over_money_batch_refuses_patched_left_over_money(model, monkeypatch):
+    monkeypatch.setattr(Household, 'left_over_money', left_over_money_with_m2_per_person_tax)
+
+    with pytest.raises(RuntimeError):
+        left_over_money_batch(np.ones(1), np.ones(1), np.ones(1), np.ones(1), np.ones(1), np.zeros(1, dtype=bool))
+
+
+def _collected(batch_utility):
+    Agent.reset_id_iter()
+    run_settings = RunSettings(start_year=2012, end_year=2015, scale_factor=20_000, calibration_length=2,
+                               number_of_runs=1, batch_utility=batch_utility, seed=1)
+
+    model = Model(run_settings, PARAMETERS, Rules(), HouseholdFactory(), HouseFactory(),
+                  data_collectors=data_collectors, collector_groups=collector_groups)
+    model.run()
+
+    return model.data
+
+
+@pytest.mark.parametrize('min_batch_size', [utility_functions.MIN_BATCH_SIZE, 1])
+def test_batch_run_collects_the_same_data_as_scalar_run(monkeypatch, min_batch_size):
+    # With a minimum batch size of 1, every brochure and every group of resized households is scored in a batch
+    monkeypatch.setattr(utility_functions, 'MIN_BATCH_SIZE', min_batch_size)
+    monkeypatch.setattr(market, 'MIN_BATCH_SIZE', min_batch_size)
+
+    np.testing.assert_equal(_collected(batch_utility=True), _collected(batch_utility=False))
@@ -0,0 +1,45 @@
+import numpy as np
+
+from model.constants import MIN_AGE, MAX_AGE
+from model.data_loader.load_money_data import load_money_data
+from model.factories import household_factory
+from model.factories.household_factory import age_to_bottom_of_age_group, get_money_batch
+
+
+def _bracket_mean(age, percentile, data):
+    # The bracket lookup one household at a time: the first bracket whose cumulative percentile reaches the
+    # percentile, else the last one
+    min_age = age_to_bottom_of_age_group(age)
+    brackets = data[(min_age, 100 if min_age == 85 else min_age + 10)]
+
+    total_percentile = 0
+    for group_percentile, mean_val, _ in brackets:
+        if percentile <= total_percentile + group_percentile:
+            return mean_val
+
+        total_percentile += group_percentile
+
+    return brackets[-1][1]
+
+
+def test_get_money_batch_picks_the_bracket_of_each_percentile(monkeypatch):
+    # Every bracket draws its mean, so the money tells which bracket was picked
+    monkeypatch.setattr(household_factory, 'skewed_distribution',
+                        lambda mean, median, size, random_state: np.full(size, mean))
+    data = load_money_data("data/household_income.csv")[2012]
+
+    ages = np.arange(MIN_AGE, MAX_AGE).repeat(20)
+    percentiles = np.random.default_rng(1).random(len(ages))
+
+    # Percentiles on the bracket bounds, and past the last one
+    for age in range(MIN_AGE, MAX_AGE, 5):
+        min_age = age_to_bottom_of_age_group(age)
+        bounds = np.cumsum([bracket[0] for bracket in data[(min_age, 100 if min_age == 85 else min_age + 10)]])
+        ages = np.append(ages, [age] * (len(bounds) + 1))
+        percentiles = np.append(percentiles, np.append(bounds, 1.0))
+
+    money = get_money_batch(ages, percentiles, data)
+
+    expected = [round(_bracket_mean(age, percentile, data) * 1000)
+                for age, percentile in zip(ages.tolist(), percentiles.tolist())]
+    np.testing.assert_array_equal(money, expected)
@@ -0,0 +1,60 @@
+import pytest
+
+from model.agents.agent import Agent
+from model.constants import MIN_AGE, MAX_AGE, MIN_HOUSEHOLD_SIZE, MAX_HOUSEHOLD_SIZE
+from model.factories.house_factory import HouseFactory
+from model.factories.household_factory import HouseholdFactory
+from model.model import Model
+from model.runner.runner import RunSettings, Parameters, Rules
+from model.utility_functions import default_utility_function
+
+
+@pytest.fixture
+def model():
+    Agent.reset_id_iter()
+    run_settings = RunSettings(start_year=2012, end_year=2013, scale_factor=20_000, calibration_length=1,
+                               number_of_runs=1, seed=1)
+    parameters = Parameters(default_utility_function, buy_market_price_params=[250, 1500, 180000],
+                            rent_market_price_params=[4, 8, 150])
+
+    model = Model(run_settings, parameters, Rules(), HouseholdFactory(), HouseFactory())
+    model._initialize()
+    model._tick(calibrate=True)
+
+    return model
+
+
+def _assert_cohorts_match_households(households):
+    for min_age in range(MIN_AGE, MAX_AGE, 5):
+        for max_age in (min_age + 1, min_age + 10):
+            for size in range(MIN_HOUSEHOLD_SIZE, MAX_HOUSEHOLD_SIZE + 1):
+                expected = sorted((household for household in households.values()
+                                   if min_age <= household.age < max_age and household.size == size),
+                                  key=lambda household: household.id)
+
+                assert households.in_cohort(min_age, max_age, size) == expected
+
+
+def test_cohorts_follow_ageing_and_resizing(model):
+    households = model.households
+    _assert_cohorts_match_households(households)
+
+    for year in range(3):
+        households.age_one_year()
+
+        for household in list(households.values())[year::7]:
+            households.resize(household, MIN_HOUSEHOLD_SIZE + (household.size + year) % MAX_HOUSEHOLD_SIZE)
+
+        _assert_cohorts_match_households(households)
+
+
+def test_cohorts_follow_adding_and_removing(model):
+    households = model.households
+    removed = list(households.values())[::3]
+
+    households.remove_all(removed)
+    _assert_cohorts_match_households(households)
+
+    model.year = 2013
+    model.household_factory.balance_households(model)
+    _assert_cohorts_match_households(households)
@@ -0,0 +1,53 @@
+import collections
+import random
+
+import pytest
+
+from model.containers.listings import Listings
+
+Listing = collections.namedtuple('Listing', ['house', 'value'])
+
+
+@pytest.fixture
+def listings():
+    return Listings(index_values=True, decays=lambda listing: True, decay_factor=0.97)
+
+
+def _check_index(listings):
+    values = [listings[house_id].value for house_id in listings._by_value]
+
+    assert values == sorted(values)
+    assert sorted(listings._by_value) == sorted(listings)
+
+
+def test_index_stays_sorted_across_decays(listings):
+    draw = random.Random(1)
+
+    for tick in range(200):
+        for _ in range(5):
+            house_id = draw.randrange(100)
+            if house_id in listings and draw.random() < 0.5:
+                del listings[house_id]
+            else:
+                listings[house_id] = Listing(house_id, draw.randrange(1, 1000))
+
+        listings.decay()
+        _check_index(listings)
+
+
+def test_sample_affordable_only_returns_affordable_listings(listings):
+    for house_id in range(50):
+        listings[house_id] = Listing(house_id, 10 * house_id)
+    listings.decay()
+
+    affordable = {house_id for house_id, listing in listings.items() if listing.value <= 200}
+
+    assert {listing.house for listing in listings.sample_affordable(100, 200)} == affordable
+    assert {listing.house for listing in listings.sample_affordable(5, 200)} <= affordable
+
+
+def test_listings_that_do_not_decay_cannot_be_indexed():
+    listings = Listings(index_values=True)
+
+    with pytest.raises(ValueError):
+        listings[1] = Listing(1, 100)
@@ -0,0 +1,94 @@
+import math
+
+import pytest
+
+from model.agents.agent import Agent
+from model.agents.government import TaxBase
+from model.containers.households import Households
+from model.factories.house_factory import HouseFactory
+from model.factories.household_factory import HouseholdFactory
+from model.model import Model
+from model.runner.runner import RunSettings, Parameters, Rules
+from model.util.contracts import Homeless
+from model.util.injector import Injector
+from model.utility_functions import default_utility_function
+
+
+@pytest.fixture
+def model():
+    Agent.reset_id_iter()
+    run_settings = RunSettings(start_year=2012, end_year=2013, scale_factor=20_000, calibration_length=1,
+                               number_of_runs=1, seed=1)
+    parameters = Parameters(default_utility_function, buy_market_price_params=[250, 1500, 180000],
+                            rent_market_price_params=[4, 8, 150])
+
+    model = Model(run_settings, parameters, Rules(), HouseholdFactory(), HouseFactory())
+    model._initialize()
+    model._tick(calibrate=True)
+
+    return model
+
+
+def _assert_totals_match_recompute(model):
+    totals = model.government.tax_base.totals(model.government, model.households)
+
+    check = TaxBase()
+    check.recompute(model.government, model.households)
+
+    for total, expected in zip(totals, (check.total_allowance, check.total_income)):
+        assert math.isclose(total, expected, rel_tol=1e-9, abs_tol=1e-6)
+
+
+def test_changed_households_are_updated(model):
+    model.government.tax_base.totals(model.government, model.households)
+
+    for household in list(model.households.values())[::3]:
+        household.income = household.income // 2 - 100
+        household.wealth = 0
+        model.government.tax_base.changed(household)
+
+    _assert_totals_match_recompute(model)
+
+
+def test_removed_households_leave_the_totals(model):
+    model.government.tax_base.totals(model.government, model.households)
+
+    households = list(model.households.values())
+    model.households.remove_all(households[::4])
+    model.government.tax_base.changed(households[1])
+    model.households.remove(households[1])
+
+    _assert_totals_match_recompute(model)
+
+
+def test_resized_households_are_updated(model):
+    model.government.tax_base.totals(model.government, model.households)
+
+    for household in list(model.households.values())[::5]:
+        model.households.resize(household, 1 if household.size > 1 else 4)
+
+    _assert_totals_match_recompute(model)
+
+
+def test_invalidate_recomputes_everything(model):
+    model.government.tax_base.totals(model.government, model.households)
+
+    model.government.liberalisation_threshold *= 1.5
+    model.government.tax_base.invalidate()
+
+    _assert_totals_match_recompute(model)
+
+
+def test_households_can_be_kept_without_a_model(model):
+    # Homeless households, as moving out of a house lists it on the model's markets
+    homeless = [household for household in model.households.values() if isinstance(household.contract, Homeless)]
+    Injector.set_model(None)
+
+    households = Households()
+    for household in homeless:
+        households.add(household)
+    households.resize(homeless[0], 3)
+    households.remove(homeless[1])
+
+    assert len(households) == len(homeless) - 1
+    assert homeless[0] in households.in_cohort(homeless[0].age, homeless[0].age + 1, 3)